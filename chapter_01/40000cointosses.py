@@ -5,12 +5,13 @@
 #  see: https://www.stat.berkeley.edu/~aldous/Real-World/coin_tosses.html
 #
 #  RTK, 15-Mar-2022
-#  Last update: 16-Mar-2022
+#  Last update: 18-Oct-2026
 #
 ################################################################
 
 import numpy as np
 from scipy.stats import chisquare, ttest_ind
+from extract import VonNeumann
 
 #  process the raw data
 s = [i[:-1] for i in open("40000cointosses.csv")]
@@ -67,12 +68,7 @@ print("t-test: %0.8f" % p)
 print()
 
 #  Apply von Neumann "correction" to the Subject 1's flips
-flips = []
-k = 0
-while (k < len(heads)-1):
-    if (heads[k] != heads[k+1]):
-        flips.append(heads[k]) 
-    k += 2
+flips = VonNeumann(heads)
 b = np.bincount(flips)
 _, p = chisquare(b)
 print("Heads using von Neumann algorithm:")
@@ -0,0 +1,98 @@
+#
+#  file:  extract.py
+#
+#  Vectorized bit extraction:  thresholding, von Neumann
+#  debiasing, and packing bits into bytes
+#
+#  RTK, 18-Oct-2026
+#  Last update:  18-Oct-2026
+#
+################################################################
+
+import numpy as np
+
+
+################################################################
+#  Clean
+#
+def Clean(A):
+    """Replace negative and missing values with the mean of the rest"""
+
+    A = np.where(A < 0, np.nan, A)
+    A[np.isnan(A)] = np.nanmean(A)
+    return A
+
+
+################################################################
+#  Threshold
+#
+def Threshold(A, threshold):
+    """1 where A is above threshold times its median, else 0"""
+
+    return (A > threshold*np.median(A)).astype("uint8")
+
+
+################################################################
+#  VonNeumann
+#
+def VonNeumann(b):
+    """Debias bits:  keep the first of each unequal pair"""
+
+    b = np.asarray(b, dtype="uint8")
+    n = len(b) // 2
+    x = b[0:(2*n):2]
+    y = b[1:(2*n):2]
+    return x[x != y]
+
+
+################################################################
+#  PackBits
+#
+def PackBits(b):
+    """Pack bits into bytes, most significant bit first"""
+
+    n = len(b) // 8
+    return np.packbits(np.asarray(b, dtype="uint8")[:(8*n)])
+
+
+################################################################
+#  BitWriter
+#
+class BitWriter:
+    """Pack bits into bytes and write them to a file as they arrive"""
+
+    #-----------------------------------------------------------
+    #  __init__
+    #
+    def __init__(self, fname):
+        """Constructor"""
+
+        self.f = open(fname, "wb")
+        self.bits = np.zeros(0, dtype="uint8")  # fewer than 8 leftover bits
+        self.nbytes = 0                         # bytes written so far
+
+
+    #-----------------------------------------------------------
+    #  Write
+    #
+    def Write(self, b):
+        """Add bits, writing out every complete byte"""
+
+        b = np.concatenate((self.bits, np.asarray(b, dtype="uint8")))
+        n = len(b) // 8
+        PackBits(b[:(8*n)]).tofile(self.f)
+        self.bits = b[(8*n):]
+        self.nbytes += n
+
+
+    #-----------------------------------------------------------
+    #  Close
+    #
+    def Close(self):
+        """Close the file, dropping any incomplete final byte"""
+
+        self.f.close()
+
+
+# end extract.py
+
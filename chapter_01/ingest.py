@@ -0,0 +1,83 @@
+#
+#  file:  ingest.py
+#
+#  Parse whitespace-separated text data files in parallel,
+#  caching the parsed columns as .npy files
+#
+#  RTK, 18-Oct-2026
+#  Last update:  18-Oct-2026
+#
+################################################################
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+################################################################
+#  ParseText
+#
+def ParseText(fname, skiprows=0):
+    """Parse a text file of numbers into a 2D array"""
+
+    #  Split the whole file at once rather than line by line
+    with open(fname) as f:
+        for i in range(skiprows):
+            f.readline()
+        lines = f.read().split("\n")
+
+    #  Drop # comments and blank lines, as np.loadtxt does, and
+    #  leave anything else (empty or ragged files, bad values) to
+    #  np.loadtxt and its errors
+    lines = [t.split("#")[0] for t in lines]
+    lines = [t for t in lines if (t.strip() != "")]
+    try:
+        ncol = len(lines[0].split())
+        v = np.array(" ".join(lines).split(), dtype="float64")
+        return v.reshape((len(lines), ncol))
+    except (IndexError, ValueError):
+        return np.loadtxt(fname, skiprows=skiprows, ndmin=2)
+
+
+################################################################
+#  LoadText
+#
+def LoadText(fname, skiprows=0):
+    """Parse a text file, or load its cached .npy version"""
+
+    cache = "%s.skip%d.npy" % (fname, skiprows)
+    if (os.path.exists(cache)) and (os.path.getmtime(cache) >= os.path.getmtime(fname)):
+        return np.load(cache)
+
+    v = ParseText(fname, skiprows)
+    try:
+        np.save(cache, v)
+    except OSError:
+        pass  # read-only data directory, parse again next time
+    return v
+
+
+################################################################
+#  LoadFiles
+#
+def LoadFiles(fnames, skiprows=0, workers=None):
+    """Load a list of text files using a pool of processes"""
+
+    if (workers == 1) or (len(fnames) < 2):
+        return [LoadText(f, skiprows) for f in fnames]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(LoadText, fnames, [skiprows]*len(fnames)))
+
+
+################################################################
+#  LoadYears
+#
+def LoadYears(template, years, skiprows=0, workers=None):
+    """Load one file per year, e.g. template "v1_%4d_ion_flux_1h.txt" """
+
+    return LoadFiles([template % year for year in years], skiprows, workers)
+
+
+# end ingest.py
+
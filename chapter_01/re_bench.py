@@ -0,0 +1,97 @@
+#
+#  file:  re_bench.py
+#
+#  Throughput and latency of the randomness engine for each
+#  generator, output mode, and request size
+#
+#  RTK, 18-Oct-2026
+#  Last update:  18-Oct-2026
+#
+################################################################
+
+import sys
+import json
+import time
+import platform
+import numpy as np
+from RE import *
+
+
+################################################################
+#  Bench
+#
+def Bench(rng, N, budget):
+    """Time calls to rng.random(N) for about budget seconds"""
+
+    rng.random(N)  # warm up
+
+    calls = 0
+    s = time.perf_counter()
+    e = s
+    while (e - s < budget):
+        for i in range(10):
+            rng.random(N)
+        calls += 10
+        e = time.perf_counter()
+    return calls, e - s
+
+
+if (len(sys.argv) == 1):
+    print()
+    print("re_bench <output> [<kinds> [<modes> [<sizes> [<seconds>]]]]")
+    print()
+    print("  <output>  - output JSON file")
+    print("  <kinds>   - comma-separated generators and/or filenames")
+    print("              (default pcg64,mt19937,minstd,quasi,sobol,halton,urandom)")
+    print("  <modes>   - comma-separated output modes (default float,int,byte,bit)")
+    print("  <sizes>   - comma-separated request sizes (default 1,10,100,1000,10000,100000,1000000)")
+    print("  <seconds> - time per combination (default 0.25)")
+    print()
+    exit(0)
+
+oname = sys.argv[1]
+kinds = ["pcg64","mt19937","minstd","quasi","sobol","halton","urandom"]
+if (haveRDRAND):
+    kinds.append("rdrand")
+modes = ["float","int","byte","bit"]
+sizes = [1,10,100,1000,10000,100000,1000000]
+budget = 0.25
+
+if (len(sys.argv) > 2):
+    kinds = sys.argv[2].split(",")
+if (len(sys.argv) > 3):
+    modes = sys.argv[3].split(",")
+if (len(sys.argv) > 4):
+    sizes = [int(i) for i in sys.argv[4].split(",")]
+if (len(sys.argv) > 5):
+    budget = float(sys.argv[5])
+
+results = []
+print("%-12s %-6s %8s %14s %14s" % ("kind", "mode", "N", "ns/call", "values/s"))
+for kind in kinds:
+    for mode in modes:
+        for N in sizes:
+            rng = RE(kind=kind, mode=mode, high=(1000 if (mode == "int") else 1))
+            calls, secs = Bench(rng, N, budget)
+            ns = 1e9*secs/calls
+            vps = calls*N/secs
+            print("%-12s %-6s %8d %14.1f %14.4g" % (kind[-12:], mode, N, ns, vps))
+            results.append({
+                "kind": kind,               # generator or filename
+                "mode": mode,               # output mode
+                "N": N,                     # values per call
+                "calls": calls,             # calls timed
+                "seconds": secs,            # total time
+                "ns_per_call": ns,          # latency
+                "values_per_sec": vps,      # throughput
+            })
+
+with open(oname, "w") as f:
+    json.dump({
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "rdrand": haveRDRAND,
+        "results": results,
+    }, f, indent=1)
+
@@ -0,0 +1,307 @@
+#
+#  file:  stream_tests.py
+#
+#  A streaming battery of statistical tests for random byte
+#  files and randomness engine output.  The input is processed
+#  in chunks, split across worker processes, so memory use is
+#  bounded no matter the input size.
+#
+#  Tests follow NIST SP 800-22 (monobit, runs, serial, approximate
+#  entropy) and Menezes, et al., Handbook of Applied Cryptography
+#  5.4.4 (autocorrelation) plus a chi-square test of byte values.
+#
+#  RTK, 18-Oct-2026
+#  Last update:  18-Oct-2026
+#
+################################################################
+
+import os
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.special import erfc, gammaincc
+from RE import *
+
+SERIAL_M = 4        # serial test pattern length
+APEN_M = 3          # approximate entropy pattern length
+LAGS = [1,2,8,16]   # autocorrelation lags (lag 1 also gives the runs test)
+CHUNK = 1 << 18     # bytes per chunk
+
+#  Pattern lengths needed, and the number of bits carried across
+#  a chunk boundary to count everything that spans it
+PATTERNS = sorted(set([SERIAL_M, SERIAL_M-1, SERIAL_M-2, APEN_M, APEN_M+1]) - set([0]))
+CARRY = max(max(PATTERNS)-1, max(LAGS))
+
+
+################################################################
+#  Patterns
+#
+def Patterns(b, k, start=None):
+    """Counts of the overlapping k-bit patterns in b"""
+
+    n = len(b) - k + 1
+    if (start != None):
+        n = min(n, start)  # only windows starting before start
+    if (n <= 0):
+        return np.zeros(1 << k, dtype="int64")
+    v = np.zeros(n, dtype="uint8")
+    for j in range(k):
+        v = (v << 1) | b[j:(j+n)]
+    return np.bincount(v, minlength=1 << k)
+
+
+################################################################
+#  Xors
+#
+def Xors(b, d, start=None):
+    """Number of positions i where b[i] != b[i+d]"""
+
+    n = len(b) - d
+    if (start != None):
+        n = min(n, start)  # only pairs starting before start
+    if (n <= 0):
+        return 0
+    return int((b[:n] != b[d:(d+n)]).sum())
+
+
+################################################################
+#  NewStats
+#
+def NewStats():
+    """Return empty sufficient statistics"""
+
+    return {
+        "n": 0,                                             # number of bits
+        "ones": 0,                                          # number of one bits
+        "bytes": np.zeros(256, dtype="int64"),              # byte value counts
+        "xors": {d: 0 for d in LAGS},                       # lag d disagreements
+        "patterns": {k: np.zeros(1 << k, dtype="int64") for k in PATTERNS},
+        "head": np.zeros(0, dtype="uint8"),                 # first CARRY bits
+        "tail": np.zeros(0, dtype="uint8"),                 # last CARRY bits
+    }
+
+
+################################################################
+#  Join
+#
+def Join(stats, head, tail):
+    """Count everything spanning the end of stats and a following block"""
+
+    #  Windows and pairs that start in the previous tail and end
+    #  in the following head
+    t = stats["tail"]
+    j = np.concatenate((t, head))
+    a = len(t)
+    for k in PATTERNS:
+        s = a - min(k-1, a)
+        stats["patterns"][k] += Patterns(j[s:], k, start=a-s)
+    for d in LAGS:
+        s = a - min(d, a)
+        stats["xors"][d] += Xors(j[s:], d, start=a-s)
+
+    #  Keep the first and last CARRY bits of the stream
+    if (len(stats["head"]) < CARRY):
+        stats["head"] = np.concatenate((stats["head"], head))[:CARRY]
+    stats["tail"] = np.concatenate((t, tail))[-CARRY:]
+
+
+################################################################
+#  Update
+#
+def Update(stats, c):
+    """Add a chunk of bytes"""
+
+    b = np.unpackbits(c)
+    stats["n"] += len(b)
+    stats["ones"] += int(b.sum())
+    stats["bytes"] += np.bincount(c, minlength=256)
+    for k in PATTERNS:
+        stats["patterns"][k] += Patterns(b, k)
+    for d in LAGS:
+        stats["xors"][d] += Xors(b, d)
+    Join(stats, b[:CARRY], b[-CARRY:])
+
+
+################################################################
+#  Merge
+#
+def Merge(stats, s):
+    """Append the statistics of the following block s"""
+
+    stats["n"] += s["n"]
+    stats["ones"] += s["ones"]
+    stats["bytes"] += s["bytes"]
+    for k in PATTERNS:
+        stats["patterns"][k] += s["patterns"][k]
+    for d in LAGS:
+        stats["xors"][d] += s["xors"][d]
+    Join(stats, s["head"], s["tail"])
+
+
+################################################################
+#  FileWorker
+#
+def FileWorker(args):
+    """Statistics for bytes [start,end) of a file"""
+
+    fname, start, end = args
+    m = np.memmap(fname, dtype="uint8", mode="r")
+    stats = NewStats()
+    for i in range(start, end, CHUNK):
+        Update(stats, np.array(m[i:min(i+CHUNK, end)]))
+    return stats
+
+
+################################################################
+#  REWorker
+#
+def REWorker(args):
+    """Statistics for nbytes from one substream of a generator"""
+
+    kind, seed, worker, nworkers, nbytes = args
+    rng = RE(kind=kind, mode="byte", seed=seed)
+    if (nworkers > 1):
+        rng = rng.spawn(nworkers)[worker]
+    stats = NewStats()
+    buf = np.zeros(CHUNK, dtype="uint8")
+    for i in range(0, nbytes, CHUNK):
+        n = min(CHUNK, nbytes - i)
+        if (kind == "sobol") or (kind == "halton"):
+            #  (n, dim) blocks of points, test the coordinates in order
+            Update(stats, np.ravel(rng.random(-(-n // rng.dim)))[:n])
+        else:
+            Update(stats, rng.random(n, out=buf[:n]) if (n > 1) else np.array([rng.random()], dtype="uint8"))
+    return stats
+
+
+################################################################
+#  Report
+#
+def Report(stats):
+    """Return a list of (test, statistic, p-value) tuples"""
+
+    n = stats["n"]
+    res = []
+
+    #  Wrap the pattern counts around, as NIST does
+    head, tail = stats["head"], stats["tail"]
+    for k in PATTERNS:
+        s = len(tail) - min(k-1, len(tail))
+        stats["patterns"][k] += Patterns(np.concatenate((tail[s:], head)), k, start=len(tail)-s)
+
+    #  Monobit
+    s = abs(2*stats["ones"] - n) / np.sqrt(n)
+    res.append(("monobit", s, erfc(s/np.sqrt(2))))
+
+    #  Runs
+    pi = stats["ones"] / n
+    v = stats["xors"][1] + 1
+    if (abs(pi - 0.5) >= 2/np.sqrt(n)):
+        res.append(("runs", v, 0.0))  # frequency prerequisite fails
+    else:
+        s = abs(v - 2*n*pi*(1-pi)) / (2*np.sqrt(2*n)*pi*(1-pi))
+        res.append(("runs", v, erfc(s)))
+
+    #  Serial
+    def psi(k):
+        if (k == 0):
+            return 0.0
+        c = stats["patterns"][k]
+        return (1 << k)*(c*c).sum()/n - n
+    m = SERIAL_M
+    d1 = psi(m) - psi(m-1)
+    d2 = psi(m) - 2*psi(m-1) + psi(m-2)
+    res.append(("serial1", d1, gammaincc(2**(m-2), d1/2)))
+    res.append(("serial2", d2, gammaincc(2**(m-3), d2/2)))
+
+    #  Approximate entropy
+    def phi(k):
+        c = stats["patterns"][k]
+        c = c[c > 0] / n
+        return (c*np.log(c)).sum()
+    m = APEN_M
+    chi = 2*n*(np.log(2) - (phi(m) - phi(m+1)))
+    res.append(("apen", chi, gammaincc(2**(m-1), chi/2)))
+
+    #  Byte value chi-square
+    c = stats["bytes"]
+    e = c.sum() / 256
+    chi = ((c - e)**2 / e).sum()
+    res.append(("bytes", chi, gammaincc(255/2, chi/2)))
+
+    #  Autocorrelation
+    for d in LAGS:
+        z = 2*(stats["xors"][d] - (n-d)/2) / np.sqrt(n-d)
+        res.append(("autocorr%d" % d, z, erfc(abs(z)/np.sqrt(2))))
+
+    return res
+
+
+################################################################
+#  RunTests
+#
+def RunTests(source, nbytes=None, nworkers=1, seed=None):
+    """Run the battery over a file or an RE kind"""
+
+    if (os.path.exists(source)):
+        #  File, split into contiguous segments
+        size = os.path.getsize(source)
+        if (nbytes == None) or (nbytes > size):
+            nbytes = size
+        step = -(-nbytes // nworkers)
+        jobs = [(source, i, min(i+step, nbytes)) for i in range(0, nbytes, step)]
+        worker = FileWorker
+    else:
+        #  Generator, one substream per worker for pcg64 and mt19937
+        if (nbytes == None):
+            raise ValueError("nbytes is required for RE kinds")
+        if (source != "pcg64") and (source != "mt19937") and (nworkers > 1):
+            print("Note: %s has no independent substreams, using 1 worker instead of %d" % (source, nworkers), file=sys.stderr)
+            nworkers = 1
+        step = -(-nbytes // nworkers)
+        jobs = [(source, seed, w, nworkers, min(step, nbytes - w*step)) for w in range(nworkers)]
+        worker = REWorker
+
+    if (len(jobs) == 1):
+        parts = [worker(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            parts = list(pool.map(worker, jobs))
+
+    stats = NewStats()
+    for s in parts:
+        Merge(stats, s)
+    return Report(stats)
+
+
+if (__name__ == "__main__"):
+    #  RE kinds need a byte count
+    if (len(sys.argv) == 1) or ((not os.path.exists(sys.argv[1])) and
+                                ((len(sys.argv) == 2) or (sys.argv[2] == "all"))):
+        print()
+        print("stream_tests <source> [<nbytes>|all] [<workers>] [<seed>]")
+        print()
+        print("  <source>  - file of random bytes or RE kind (pcg64, minstd, etc)")
+        print("  <nbytes>  - bytes to test (required for RE kinds, default all of a file)")
+        print("  <workers> - number of worker processes (default 1)")
+        print("  <seed>    - RE seed (default none)")
+        print()
+        exit(0)
+
+    source = sys.argv[1]
+    nbytes = None
+    nworkers = 1
+    seed = None
+    if (len(sys.argv) > 2) and (sys.argv[2] != "all"):
+        nbytes = int(sys.argv[2])
+    if (len(sys.argv) > 3):
+        nworkers = int(sys.argv[3])
+    if (len(sys.argv) > 4):
+        seed = int(sys.argv[4])
+
+    print("%-12s %16s %12s" % ("test", "statistic", "p-value"))
+    for name, s, p in RunTests(source, nbytes, nworkers, seed):
+        print("%-12s %16.6f %12.8f %s" % (name, s, p, "" if (p >= 0.01) else "*"))
+    print()
+    print("(* = fails at the 0.01 level)")
+
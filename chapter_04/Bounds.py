@@ -60,21 +60,32 @@ class Bounds:
     def Limits(self, pos):
         """Apply the selected boundary conditions"""
 
-        npart, ndim = pos.shape
-
-        for i in range(npart):
-            if (self.enforce == "resample"):
-                for j in range(ndim):
-                    if (pos[i,j] <= self.lower[j]) or (pos[i,j] >= self.upper[j]):
-                        pos[i,j] = self.lower[j] + (self.upper[j]-self.lower[j])*self.rng.random()
-            else:  # clip
-                for j in range(ndim):
-                    if (pos[i,j] <= self.lower[j]):
-                        pos[i,j] = self.lower[j]
-                    if (pos[i,j] >= self.upper[j]):
-                        pos[i,j] = self.upper[j]
-            
-            #  Also validate
+        if (self.enforce == "resample"):
+            #  One draw for every out of range component, in the same
+            #  (row by row) order as resampling them one at a time
+            bad = (pos <= self.lower) | (pos >= self.upper)
+            n = int(bad.sum())
+            if (n > 0):
+                lower = np.broadcast_to(self.lower, pos.shape)[bad]
+                width = np.broadcast_to(self.upper - self.lower, pos.shape)[bad]
+                pos[bad] = lower + width*self.rng.random(n)
+        else:  # clip
+            np.clip(pos, self.lower, self.upper, out=pos)
+
+        #  Also validate
+        return self.ValidateBatch(pos)
+
+
+    #-----------------------------------------------------------
+    #  ValidateBatch
+    #
+    #  Override this to validate the whole swarm at once, otherwise
+    #  each position vector is passed to Validate.
+    #
+    def ValidateBatch(self, pos):
+        """Validate a set of position vectors"""
+
+        for i in range(pos.shape[0]):
             pos[i] = self.Validate(pos[i])
 
         return pos
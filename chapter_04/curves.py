@@ -49,6 +49,17 @@ class Objective:
         y = eval(self.func)
         return ((y - self.y)**2).mean()
 
+    def EvaluateBatch(self, pos):
+        """Evaluate all the positions at once"""
+
+        #  p[k] is then a column of the k-th parameters, so each
+        #  row of y is one position's curve
+        self.fcount += len(pos)
+        x = self.x
+        p = pos.T[:,:,np.newaxis]
+        y = eval(self.func)
+        return ((y - self.y)**2).mean(axis=-1)
+
 
 ################################################################
 #  GetBounds
@@ -51,9 +51,11 @@ class MiCRO:
                  init=None,       # swarm initialization object (subclass Initializer)
                  done=None,       # custom Done object (subclass Done)
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng=None):       # randomness engine
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -144,6 +146,13 @@ class MiCRO:
     def Evaluate(self, pos):
         """Evaluate the positions"""
 
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
         v = []
         for i in range(self.npart):
             v.append(self.obj.Evaluate(pos[i]))
@@ -156,36 +165,30 @@ class MiCRO:
     def UpdatePositions(self):
         """Return a set of new positions"""
 
-        for i in range(self.npart):
-            graze = True
-            if (self.rng.random() < self.glimpse):
-                #  Look up
-                idx = np.where(self.vpos < self.vpos[i])[0]
-                if (len(idx) != 0):
-                    graze = False
-                    k = int(len(idx)*self.rng.random())
-                    n = []
-                    for j in range(self.ndim):
-                        n.append(normal(self.rng)/5.0)
-                    self.pos[i] = self.pos[k] + 2*self.eta*self.pos[k]*np.array(n)
-                    self.vpos[i] = self.obj.Evaluate(self.pos[i])
-
-            if (graze):
-                #  Continue grazing
-                n = []
-                for j in range(self.ndim):
-                    n.append(normal(self.rng)/5.0)
-                pos = self.pos[i] + self.eta*self.pos[i]*np.array(n)
-                vpos = self.obj.Evaluate(pos)
-                if (vpos < self.vpos[i]):
-                    self.pos[i] = pos
-                    self.vpos[i] = vpos
-
-        #  Enforce limits and get final objective function values
+        #  All the perturbations and decisions in one draw each
+        n = np.reshape(self.rng.normal(self.npart*self.ndim), (self.npart, self.ndim)) / 5.0
+        u = np.reshape(self.rng.random(2*self.npart), (2, self.npart))
+
+        #  Look up:  now and then a particle jumps near a random one
+        #  of those doing better, the first nbetter in sorted order
+        order = np.argsort(self.vpos, kind="stable")
+        nbetter = np.searchsorted(self.vpos[order], self.vpos, side="left")
+        look = (u[0] < self.glimpse) & (nbetter > 0)
+        k = order[(nbetter*u[1]).astype("int64")]
+
+        #  Otherwise continue grazing
+        pos = self.pos + self.eta*self.pos*n
+        pos[look] = self.pos[k[look]] + 2*self.eta*self.pos[k[look]]*n[look]
+
+        #  Enforce limits and evaluate all the candidates at once
         if (self.bounds != None):
-            self.pos = self.bounds.Limits(self.pos)
+            pos = self.bounds.Limits(pos)
+        vpos = self.Evaluate(pos)
 
-        self.vpos = self.Evaluate(self.pos)
+        #  Lookers always move, grazers only if better
+        i = np.where(look | (vpos < self.vpos))[0]
+        self.pos[i] = pos[i]
+        self.vpos[i] = vpos[i]
 
 
     #-----------------------------------------------------------
@@ -196,13 +199,14 @@ class MiCRO:
 
         self.UpdatePositions()  #  update self.pos and self.vpos
 
-        #  Check for new global bests
-        for i in range(self.npart):
-            if (self.vpos[i] < self.gbest[-1]):     # is new position global best?
-                self.gbest.append(self.vpos[i])     # new position is new swarm best
-                self.gpos.append(self.pos[i])       # keep the position
-                self.gidx.append(i)                 # particle number
-                self.giter.append(self.iterations)  # and when it happened
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], self.vpos)))[:-1]
+        for i in np.where(self.vpos < prev)[0]:
+            self.gbest.append(self.vpos[i])         # new position is new swarm best
+            self.gpos.append(self.pos[i].copy())    # keep the position
+            self.gidx.append(i)                     # particle number
+            self.giter.append(self.iterations)      # and when it happened
 
         self.iterations += 1
 
@@ -63,9 +63,11 @@ class PSO:
                  neighbors=2,     # number of particle neighbors for ring, must be even
                  vbounds=None,    # velocity bounds object
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng=None):       # randomness source
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -141,6 +143,9 @@ class PSO:
         self.gpos = []
         self.giter = []
 
+        #  Ring neighborhoods, one row per particle
+        self.nbrs = np.array([self.RingNeighborhood(i) for i in range(self.npart)])
+
         self.gidx.append(np.argmin(self.xbest))
         self.gbest.append(self.xbest[self.gidx[-1]])
         self.gpos.append(self.xpos[self.gidx[-1]].copy())
@@ -172,6 +177,13 @@ class PSO:
     def Evaluate(self, pos):
         """Evaluate a set of positions"""
 
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
         p = np.zeros(self.npart)
         for i in range(self.npart):
             p[i] = self.obj.Evaluate(pos[i])
@@ -215,25 +227,44 @@ class PSO:
         return lbest, lpos
 
 
+    #-----------------------------------------------------------
+    #  NeighborhoodBests
+    #
+    def NeighborhoodBests(self):
+        """Return neighborhood bests and positions for all particles"""
+
+        if (not self.ring):
+            lbest = np.full(self.npart, self.gbest[-1])
+            return lbest, np.tile(self.gpos[-1], (self.npart,1))
+
+        #  Best of each row of the ring neighborhoods, the first
+        #  one if tied as in NeighborhoodBest
+        k = np.argmin(self.xbest[self.nbrs], axis=1)
+        idx = self.nbrs[np.arange(self.npart), k]
+        lpos = self.xpos[idx]
+
+        #  No neighbor below 1e9, use the first particle's best position
+        lpos[self.xbest[idx] >= 1e9] = self.xpos[0]
+
+        return self.xbest[idx], lpos
+
+
     #-----------------------------------------------------------
     #  BareBonesUpdate
     #
     def BareBonesUpdate(self):
         """Apply a bare-bones update to the positions"""
 
-        pos = np.zeros((self.npart, self.ndim))
+        lbest, lpos = self.NeighborhoodBests()
+        m = 0.5*(lpos + self.xpos)
+        s = np.abs(lpos - self.xpos)
 
-        for i in range(self.npart):
-            lbest, lpos = self.NeighborhoodBest(i)
-            for j in range(self.ndim):
-                if (self.rng.random() < self.bare_prob):
-                    m = 0.5*(lpos[j] + self.xpos[i,j])
-                    s = np.abs(lpos[j] - self.xpos[i,j])
-                    pos[i,j] = normal(self.rng, m,s)
-                else:
-                    pos[i,j] = self.xpos[i,j]
+        #  Sample a normal for every component, keep those selected
+        n = self.npart*self.ndim
+        z = np.reshape(self.rng.normal(n), (self.npart, self.ndim))
+        u = np.reshape(self.rng.random(n), (self.npart, self.ndim))
 
-        return pos
+        return np.where(u < self.bare_prob, m + s*z, self.xpos)
 
 
     #-----------------------------------------------------------
@@ -252,14 +283,15 @@ class PSO:
             #  Bare-bones position update
             self.pos = self.BareBonesUpdate()
         else:
-            #  Canonical position/velocity update
-            for i in range(self.npart):
-                lbest, lpos = self.NeighborhoodBest(i)
-                c1 = self.c1 * self.rng.random(self.ndim)
-                c2 = self.c2 * self.rng.random(self.ndim)
-                self.vel[i] = w*self.vel[i] +                    \
-                              c1*(self.xpos[i] - self.pos[i]) +  \
-                              c2*(lpos - self.pos[i])
+            #  Canonical position/velocity update, drawing the c1 and
+            #  c2 factors particle by particle as one block
+            lbest, lpos = self.NeighborhoodBests()
+            r = np.reshape(self.rng.random(2*self.npart*self.ndim), (self.npart, 2, self.ndim))
+            c1 = self.c1 * r[:,0]
+            c2 = self.c2 * r[:,1]
+            self.vel = w*self.vel +                    \
+                       c1*(self.xpos - self.pos) +     \
+                       c2*(lpos - self.pos)
 
             #  Keep velocities bounded
             if (self.vbounds != None):
@@ -275,16 +307,19 @@ class PSO:
         #  Evaluate the new positions
         p = self.Evaluate(self.pos)
 
-        #  Check if any new particle and swarm bests
-        for i in range(self.npart):
-            if (p[i] < self.xbest[i]):                  # is new position a particle best?
-                self.xbest[i] = p[i]                    # keep the function value
-                self.xpos[i] = self.pos[i]              # and position
-            if (p[i] < self.gbest[-1]):                 # is new position global best?
-                self.gbest.append(p[i])                 # new position is new swarm best
-                self.gpos.append(self.pos[i].copy())    # keep the position
-                self.gidx.append(i)                     # particle number
-                self.giter.append(self.iterations)      # and when it happened
+        #  New particle bests
+        i = np.where(p < self.xbest)[0]
+        self.xbest[i] = p[i]                            # keep the function values
+        self.xpos[i] = self.pos[i]                      # and positions
+
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], p)))[:-1]
+        for i in np.where(p < prev)[0]:
+            self.gbest.append(p[i])                     # new position is new swarm best
+            self.gpos.append(self.pos[i].copy())        # keep the position
+            self.gidx.append(i)                         # particle number
+            self.giter.append(self.iterations)          # and when it happened
 
         self.iterations += 1
 
@@ -50,9 +50,11 @@ class RO:
                  init=None,       # swarm initialization object (subclass Initializer)
                  done=None,       # custom Done object (subclass Done)
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng=None):       # randomness engine
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -142,6 +144,13 @@ class RO:
     def Evaluate(self, pos):
         """Evaluate a set of positions"""
 
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
         p = np.zeros(self.npart)
         for i in range(self.npart):
             p[i] = self.obj.Evaluate(pos[i])
@@ -154,10 +163,8 @@ class RO:
     def CandidatePositions(self):
         """Return a set of candidate positions"""
         
-        n = []
-        for i in range(self.npart * self.ndim):
-            n.append(normal(self.rng)/5.0)
-        n = np.array(n).reshape((self.npart, self.ndim))
+        #  All the perturbations in one draw
+        n = np.reshape(self.rng.normal(self.npart*self.ndim), (self.npart, self.ndim)) / 5.0
         pos = self.pos + self.eta*self.pos*n
 
         if (self.bounds != None):
@@ -175,16 +182,19 @@ class RO:
         new_pos = self.CandidatePositions() # get new candidate positions
         p = self.Evaluate(new_pos)          # and evaluate them
 
-        #  For each particle
-        for i in range(self.npart):
-            if (p[i] < self.vpos[i]):               # is new position better?
-                self.vpos[i] = p[i]                 # keep the function value
-                self.pos[i] = new_pos[i]            # and new position
-            if (p[i] < self.gbest[-1]):             # is new position global best?
-                self.gbest.append(p[i])             # new position is new swarm best
-                self.gpos.append(new_pos[i])        # keep the position
-                self.gidx.append(i)                 # particle number
-                self.giter.append(self.iterations)  # and when it happened
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], p)))[:-1]
+        for i in np.where(p < prev)[0]:
+            self.gbest.append(p[i])             # new position is new swarm best
+            self.gpos.append(new_pos[i])        # keep the position
+            self.gidx.append(i)                 # particle number
+            self.giter.append(self.iterations)  # and when it happened
+
+        #  Keep the better of each old and new position
+        i = np.where(p < self.vpos)[0]
+        self.vpos[i] = p[i]                     # keep the function values
+        self.pos[i] = new_pos[i]                # and new positions
 
         self.iterations += 1
 
@@ -29,9 +29,11 @@ class GWO:
                  init=None,       # swarm initialization object (subclass Initializer)
                  done=None,       # custom Done object (subclass Done)
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng=None):       # randomness engine
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -81,9 +83,7 @@ class GWO:
         self.iterations = 0
        
         self.pos = self.init.InitializeSwarm()  # initial swarm positions
-        self.vpos= np.zeros(self.npart)
-        for i in range(self.npart):
-            self.vpos[i] = self.obj.Evaluate(self.pos[i])
+        self.vpos= self.Evaluate(self.pos)
 
         #  Swarm bests
         self.gidx = []
@@ -125,6 +125,25 @@ class GWO:
                         iteration=self.iterations)
 
 
+    #-----------------------------------------------------------
+    #  Evaluate
+    #
+    def Evaluate(self, pos):
+        """Evaluate a set of positions"""
+
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
+        p = np.zeros(self.npart)
+        for i in range(self.npart):
+            p[i] = self.obj.Evaluate(pos[i])
+        return p
+
+
     #-----------------------------------------------------------
     #  Step
     #
@@ -134,60 +153,41 @@ class GWO:
         #  a from eta ... zero (default eta is 2)
         a = self.eta - self.eta*(self.iterations/self.max_iter)
 
-        #  Update everyone
-        for i in range(self.npart):
-            A = 2*a*self.rng.random(self.ndim) - a
-            C = 2*self.rng.random(self.ndim)
-            Dalpha = np.abs(C*self.alpha - self.pos[i]) 
-            X1 = self.alpha - A*Dalpha
-
-            A = 2*a*self.rng.random(self.ndim) - a
-            C = 2*self.rng.random(self.ndim)
-            Dbeta = np.abs(C*self.beta - self.pos[i]) 
-            X2 = self.beta - A*Dbeta
-
-            A = 2*a*self.rng.random(self.ndim) - a
-            C = 2*self.rng.random(self.ndim)
-            Ddelta = np.abs(C*self.delta - self.pos[i]) 
-            X3 = self.delta - A*Ddelta 
-            
-            self.pos[i,:] = (X1+X2+X3) / 3.0
+        #  Update everyone.  The A and C coefficients for alpha, beta,
+        #  and delta come from one draw, in the same order as drawing
+        #  them wolf by wolf.
+        r = np.reshape(self.rng.random(6*self.npart*self.ndim), (self.npart, 3, 2, self.ndim))
+        A = 2*a*r[:,:,0] - a
+        C = 2*r[:,:,1]
+        leaders = np.array([self.alpha, self.beta, self.delta])
+        D = np.abs(C*leaders - self.pos[:,np.newaxis,:])
+        X = leaders - A*D
+        self.pos = (X[:,0] + X[:,1] + X[:,2]) / 3.0
 
         #  Keep in bounds
         if (self.bounds != None):
             self.pos = self.bounds.Limits(self.pos)
 
-        #  Get objective function values and check for new leaders
-        for i in range(self.npart):
-            self.vpos[i] = self.obj.Evaluate(self.pos[i])
-			
-            #  new alpha?
-            if (self.vpos[i] < self.valpha):
-                self.vdelta = self.vbeta
-                self.delta = self.beta.copy()
-                self.vbeta = self.valpha
-                self.beta = self.alpha.copy()
-                self.valpha = self.vpos[i]
-                self.alpha = self.pos[i].copy()
-
-            #  new beta?
-            if (self.vpos[i] > self.valpha) and (self.vpos[i] < self.vbeta):
-                self.vdelta = self.vbeta
-                self.delta = self.beta.copy()
-                self.vbeta = self.vpos[i]
-                self.beta = self.pos[i].copy()
-            
-            #  new delta?
-            if (self.vpos[i] > self.valpha) and (self.vpos[i] < self.vbeta) and (self.vpos[i] < self.vdelta):
-                self.vdelta = self.vpos[i]
-                self.delta = self.pos[i].copy()
-
-            #  is alpha new swarm best?
-            if (self.valpha < self.gbest[-1]):
-                self.gidx.append(i)
-                self.gbest.append(self.valpha)
-                self.gpos.append(self.alpha.copy())
-                self.giter.append(self.iterations)
+        #  Get objective function values
+        self.vpos = self.Evaluate(self.pos)
+
+        #  New leaders are the three best of the old leaders and the
+        #  new positions
+        v = np.concatenate(([self.valpha, self.vbeta, self.vdelta], self.vpos))
+        p = np.concatenate((leaders, self.pos))
+        k = np.argpartition(v, 2)[:3]
+        k = k[np.argsort(v[k])]
+        self.valpha, self.vbeta, self.vdelta = v[k]
+        self.alpha, self.beta, self.delta = p[k[0]].copy(), p[k[1]].copy(), p[k[2]].copy()
+
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], self.vpos)))[:-1]
+        for i in np.where(self.vpos < prev)[0]:
+            self.gidx.append(i)
+            self.gbest.append(self.vpos[i])
+            self.gpos.append(self.pos[i].copy())
+            self.giter.append(self.iterations)
 
         self.iterations += 1
 
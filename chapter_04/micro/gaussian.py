@@ -53,6 +53,9 @@ class Objective:
         return -5.0*np.exp(-0.5*((p[0]+2.2)**2/0.4+(p[1]-4.3)**2/0.4)) +  \
                -2.0*np.exp(-0.5*((p[0]-2.2)**2/0.4+(p[1]+4.3)**2/0.4))
 
+    def EvaluateBatch(self, pos):
+        return self.Evaluate(pos.T)
+
 def main():
     if (len(sys.argv) == 1):
         print()
@@ -27,6 +27,7 @@ from GA import *
 from Bounds import *
 from RandomInitializer import *
 from LinearInertia import *
+from ParallelEvaluator import *
 from RE import *
 
 
@@ -103,7 +104,7 @@ class Objective:
 #
 if (len(sys.argv) == 1):
     print()
-    print("cell <map> <towers> <npart> <niter> <alg> <kind> <outdir> [frames]")
+    print("cell <map> <towers> <npart> <niter> <alg> <kind> <outdir> [frames] [<workers>]")
     print()
     print("  <map>     -  map image (.png)")
     print("  <towers>  -  text file w/towers and ranges")
@@ -113,6 +114,7 @@ if (len(sys.argv) == 1):
     print("  <kind>    -  randomness source")
     print("  <outdir>  -  output directory (overwritten)")
     print("  frames    -  'frames' ==> output frame per iteration")
+    print("  <workers> -  evaluate with this many processes (default 1)")
     print()
     exit(0)
 
@@ -125,8 +127,12 @@ kind = sys.argv[6]
 outdir = sys.argv[7]
 
 frames = False
-if (len(sys.argv) > 8):
-    frames = True
+workers = 1
+for arg in sys.argv[8:]:
+    if (arg == "frames"):
+        frames = True
+    else:
+        workers = int(arg)
 
 os.system("rm -rf %s; mkdir %s" % (outdir,outdir))
 if (frames):
@@ -148,21 +154,22 @@ radius = w//2
 
 i = RandomInitializer(npart, ndim, bounds=b, rng=rng)
 obj = Objective(map_image, towers, radius)
+ev = ParallelEvaluator(obj, workers) if (workers > 1) else None
 
 if (alg == "PSO"):
-    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, inertia=LinearInertia())
+    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, inertia=LinearInertia(), evaluator=ev)
 elif (alg == "BARE"):
-    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, bare=True)
+    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, bare=True, evaluator=ev)
 elif (alg == "DE"):
-    swarm = DE(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng)
+    swarm = DE(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, evaluator=ev)
 elif (alg == "RO"):
-    swarm = RO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng)
+    swarm = RO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, evaluator=ev)
 elif (alg == "GWO"):
-    swarm = GWO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng)
+    swarm = GWO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, evaluator=ev)
 elif (alg == "JAYA"):
-    swarm = Jaya(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng)
+    swarm = Jaya(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, evaluator=ev)
 elif (alg == "GA"):
-    swarm = GA(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng)
+    swarm = GA(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, tol=1e-9, rng=rng, evaluator=ev)
 
 s = "\nIterations:\n\n"
 
@@ -185,6 +192,8 @@ while (not swarm.Done()):
         img = Image.fromarray((255*cover/cover.max()).astype("uint8"))
         img.save(outdir+"/frames/"+("frame_%05d.png" % k))
 en = time.time()
+if (ev != None):
+    ev.Close()
 
 res = swarm.Results()
 pickle.dump(res, open(outdir+"/results.pkl","wb"))
@@ -59,6 +59,18 @@ class Objective:
         
         return -dmin
 
+    def EvaluateBatch(self, pos):
+        """Evaluate all the positions at once"""
+
+        self.fcount += len(pos)
+        n = pos.shape[1]//2
+        xy = pos.reshape((len(pos),n,2))
+
+        #  Minimal separation of each position's points
+        i,j = np.triu_indices(n,1)
+        d = np.sqrt(((xy[:,i,:] - xy[:,j,:])**2).sum(axis=2))
+        return -np.minimum(d.min(axis=1), 10.0)
+
 
 ################################################################
 #  main
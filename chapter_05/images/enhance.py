@@ -32,6 +32,7 @@ from GA import *
 from RandomInitializer import *
 from LinearInertia import *
 from Bounds import *
+from ParallelEvaluator import *
 from RE import *
 
 
@@ -107,7 +108,7 @@ class Objective:
 #  main
 if (len(sys.argv) == 1):
     print()
-    print("enhance <src> <npart> <niter> <alg> <kind> <output>")
+    print("enhance <src> <npart> <niter> <alg> <kind> <output> [<workers>]")
     print()
     print("  <src>    - source grayscale image")
     print("  <npart>  - number of particles")
@@ -115,6 +116,7 @@ if (len(sys.argv) == 1):
     print("  <alg>    - BARE,RO,DE,PSO,JAYA,GWO,GA")
     print("  <kind>   - randomness source")
     print("  <output> - output directory (overwritten)")
+    print("  <workers>- evaluate with this many processes (default 1)")
     print()
     exit(0)
 
@@ -124,6 +126,7 @@ niter = int(sys.argv[3])
 alg = sys.argv[4].upper()
 kind = sys.argv[5]
 outdir = sys.argv[6]
+workers = int(sys.argv[7]) if (len(sys.argv) > 7) else 1
 
 orig = np.array(Image.open(src).convert("L"))
 img = orig / 256.0
@@ -137,21 +140,22 @@ b = Bounds([0.0,1.0,0.0,0.5], [1.5,22,1.0,1.5], enforce="resample", rng=rng)
 i = RandomInitializer(npart, ndim, bounds=b, rng=rng)
 
 obj = Objective(img)
+ev = ParallelEvaluator(obj, workers) if (workers > 1) else None
 
 if (alg == "PSO"):
-    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, inertia=LinearInertia(), rng=rng)
+    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, inertia=LinearInertia(), rng=rng, evaluator=ev)
 elif (alg == "BARE"):
-    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, bare=True)
+    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, bare=True, evaluator=ev)
 elif (alg == "DE"):
-    swarm = DE(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng)
+    swarm = DE(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, evaluator=ev)
 elif (alg == "RO"):
-    swarm = RO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng)
+    swarm = RO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, evaluator=ev)
 elif (alg == "GWO"):
-    swarm = GWO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng)
+    swarm = GWO(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, evaluator=ev)
 elif (alg == "JAYA"):
-    swarm = Jaya(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng)
+    swarm = Jaya(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, evaluator=ev)
 elif (alg == "GA"):
-    swarm = GA(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng)
+    swarm = GA(obj=obj, npart=npart, ndim=ndim, init=i, bounds=b, max_iter=niter, rng=rng, evaluator=ev)
 
 s = "\nIterations:\n\n"
 
@@ -166,6 +170,8 @@ while (not swarm.Done()):
     s += t+"\n"
     k += 1
 en = time.time()
+if (ev != None):
+    ev.Close()
 
 res = swarm.Results()
 pickle.dump(res, open(outdir+"/results.pkl","wb"))
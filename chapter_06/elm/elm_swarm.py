@@ -24,6 +24,7 @@ from PSO import *
 from Bounds import *
 from LinearInertia import *
 from RandomInitializer import *
+from ParallelEvaluator import *
 from RE import *
 
 #  global randomness source
@@ -114,7 +115,7 @@ def dist(swarm):
 
 if (len(sys.argv) == 1):
     print()
-    print("elm_swarm <hidden> <act> <npart> <niter> <alg> <output>")
+    print("elm_swarm <hidden> <act> <npart> <niter> <alg> <output> [<workers>]")
     print()
     print("  <hidden> - number hidden layer nodes")
     print("  <act>    - tanh, sigmoid, relu, cube, absolute, recip")
@@ -122,6 +123,7 @@ if (len(sys.argv) == 1):
     print("  <niter>  - number of iterations")
     print("  <alg>    - algorithm type")
     print("  <output> - output file (.pkl)")
+    print("  <workers>- evaluate with this many processes (default 1)")
     print()
     exit(0)
 
@@ -131,6 +133,7 @@ npart = int(sys.argv[3])
 niter = int(sys.argv[4])
 alg = sys.argv[5].upper()
 oname = sys.argv[6]
+workers = int(sys.argv[7]) if (len(sys.argv) > 7) else 1
 
 # load and preprocess the data
 xtrn = np.load("../data/datasets/mnist_train_data.npy")/256.0
@@ -169,22 +172,23 @@ upper = xtrn.max()
 b = Bounds([lower]*ndim, [upper]*ndim, enforce="resample", rng=rng)
 i = RandomInitializer(npart, ndim, bounds=b, rng=rng)
 obj = Objective(xtrn, ytrn, xtst, ytst, hidden)
+ev = ParallelEvaluator(obj, workers) if (workers > 1) else None
 tol = 0
 
 if (alg == "BARE"):
-    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, bare=True, rng=rng)
+    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, bare=True, rng=rng, evaluator=ev)
 elif (alg == "PSO"):
-    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, inertia=LinearInertia())
+    swarm = PSO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, inertia=LinearInertia(), evaluator=ev)
 elif (alg == "JAYA"):
-    swarm = Jaya(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng)
+    swarm = Jaya(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, evaluator=ev)
 elif (alg == "GA"):
-    swarm = GA(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng)
+    swarm = GA(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, evaluator=ev)
 elif (alg == "DE"):
-    swarm = DE(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng)
+    swarm = DE(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, evaluator=ev)
 elif (alg == "GWO"):
-    swarm = GWO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng)
+    swarm = GWO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, evaluator=ev)
 elif (alg == "RO"):
-    swarm = RO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng)
+    swarm = RO(obj=obj, npart=npart, ndim=ndim, init=i, tol=tol, max_iter=niter, bounds=b, rng=rng, evaluator=ev)
 else:
     raise ValueError("Unknown algorithm: %s" % alg)
 
@@ -196,6 +200,9 @@ while (not swarm.Done()):
     print("%3d: %0.5f (mean swarm distance %0.9f)" % (k, 1.0 - res["gbest"][-1], dist(swarm)))
     k += 1
 
+if (ev != None):
+    ev.Close()
+
 res = swarm.Results()
 updates = len(res["gbest"])
 n = xtrn.shape[1]*hidden
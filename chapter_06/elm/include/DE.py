@@ -34,9 +34,11 @@ class DE:
                  init=None,       # swarm initialization object (subclass Initializer)
                  done=None,       # custom Done object (subclass Done)
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng = None):     # randomness source
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -129,6 +131,13 @@ class DE:
     def Evaluate(self, pos):
         """Evaluate a set of positions"""
 
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
         p = np.zeros(self.npart)
         for i in range(self.npart):
             p[i] = self.obj.Evaluate(pos[i])
@@ -186,10 +195,43 @@ class DE:
     def CandidatePositions(self):
         """Return a set of candidate positions"""
 
-        pos = np.zeros((self.npart, self.ndim))
+        #  The whole population at once, as Candidate does for one
+        #  particle:  sorting random keys, with each particle's own key
+        #  pushed to the end, gives three distinct donors per particle,
+        #  none of them the particle itself
+        n = self.npart
+        keys = np.reshape(self.rng.random(n*n), (n,n))
+        keys[np.arange(n), np.arange(n)] = 2.0
+        k = np.argsort(keys, axis=1)[:,:3]
 
-        for i in range(self.npart):
-            pos[i] = self.Candidate(i)
+        v1 = self.pos[k[:,0]]
+        v2 = self.pos[k[:,1]]
+        v3 = self.pos[k[:,2]]
+
+        if (self.mode == "best"):
+            v1 = np.tile(self.gpos[-1], (n,1))
+        elif (self.mode == "toggle"):
+            #  alternate particle by particle, carrying on from the last step
+            best = (np.arange(n) % 2 == 0) == self.tmode
+            v1[best] = self.gpos[-1]
+            if (n % 2 == 1):
+                self.tmode = not self.tmode
+
+        #  Donor vectors
+        v = v1 + self.F*(v2 - v3)
+
+        #  Crossover masks, always taking component I from the donor
+        I = ((self.ndim-1)*self.rng.random(n)).astype("int64")
+        j = np.arange(self.ndim)
+        if (self.cmode == "bin"):
+            #  Bernoulli crossover
+            c = np.reshape(self.rng.random(n*self.ndim), (n, self.ndim))
+            mask = (c <= self.CR) | (j == I[:,np.newaxis])
+        else:
+            #  GA-style crossover
+            mask = (j >= I[:,np.newaxis])
+
+        pos = np.where(mask, v, self.pos)
 
         if (self.bounds != None):
             pos = self.bounds.Limits(pos)
@@ -206,16 +248,19 @@ class DE:
         new_pos = self.CandidatePositions() # get new candidate positions
         p = self.Evaluate(new_pos)          # and evaluate them
 
-        #  For each particle
-        for i in range(self.npart):
-            if (p[i] < self.vpos[i]):               # is new position better?
-                self.vpos[i] = p[i]                 # keep the function value
-                self.pos[i] = new_pos[i]            # and new position
-            if (p[i] < self.gbest[-1]):             # is new position global best?
-                self.gbest.append(p[i])             # new position is new swarm best
-                self.gpos.append(new_pos[i].copy()) # keep the position
-                self.gidx.append(i)                 # particle number
-                self.giter.append(self.iterations)  # and when it happened
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], p)))[:-1]
+        for i in np.where(p < prev)[0]:
+            self.gbest.append(p[i])             # new position is new swarm best
+            self.gpos.append(new_pos[i].copy()) # keep the position
+            self.gidx.append(i)                 # particle number
+            self.giter.append(self.iterations)  # and when it happened
+
+        #  Keep the better of each old and new position
+        i = np.where(p < self.vpos)[0]
+        self.vpos[i] = p[i]                     # keep the function values
+        self.pos[i] = new_pos[i]                # and new positions
 
         self.iterations += 1
 
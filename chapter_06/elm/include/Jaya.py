@@ -28,9 +28,11 @@ class Jaya:
                  init=None,       # swarm initialization object (subclass Initializer)
                  done=None,       # custom Done object (subclass Done)
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng=None):       # randomness source
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -118,6 +120,13 @@ class Jaya:
     def Evaluate(self, pos):
         """Evaluate a set of positions"""
 
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
         p = np.zeros(self.npart)
         for i in range(self.npart):
             p[i] = self.obj.Evaluate(pos[i])
@@ -130,18 +139,17 @@ class Jaya:
     def CandidatePositions(self):
         """Return a set of candidate positions"""
 
-        pos = np.zeros((self.npart, self.ndim))
-
-        f = np.argsort(self.vpos)
-        best = self.pos[f[0]]
-        worst= self.pos[f[-1]]
+        best = self.pos[np.argmin(self.vpos)]
+        worst= self.pos[np.argmax(self.vpos)]
 
-        for i in range(self.npart):
-            r1 = self.rng.random(self.ndim)
-            r2 = self.rng.random(self.ndim)
+        #  r1 and r2 for every particle in one draw, in the same order
+        #  as drawing them particle by particle
+        r = np.reshape(self.rng.random(2*self.npart*self.ndim), (self.npart, 2, self.ndim))
+        r1 = r[:,0]
+        r2 = r[:,1]
 
-            pos[i] = self.pos[i] + r1*(best  - np.abs(self.pos[i])) -  \
-                                   r2*(worst - np.abs(self.pos[i]))
+        pos = self.pos + r1*(best  - np.abs(self.pos)) -  \
+                         r2*(worst - np.abs(self.pos))
 
         if (self.bounds != None):
             pos = self.bounds.Limits(pos)
@@ -158,16 +166,19 @@ class Jaya:
         new_pos = self.CandidatePositions() # get new candidate positions
         p = self.Evaluate(new_pos)          # and evaluate them
 
-        #  For each particle
-        for i in range(self.npart):
-            if (p[i] < self.vpos[i]):               # is new position better?
-                self.vpos[i] = p[i]                 # keep the function value
-                self.pos[i] = new_pos[i]            # and new position
-            if (p[i] < self.gbest[-1]):             # is new position global best?
-                self.gbest.append(p[i])             # new position is new swarm best
-                self.gpos.append(new_pos[i].copy()) # keep the position
-                self.gidx.append(i)                 # particle number
-                self.giter.append(self.iterations)  # and when it happened
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], p)))[:-1]
+        for i in np.where(p < prev)[0]:
+            self.gbest.append(p[i])             # new position is new swarm best
+            self.gpos.append(new_pos[i].copy()) # keep the position
+            self.gidx.append(i)                 # particle number
+            self.giter.append(self.iterations)  # and when it happened
+
+        #  Keep the better of each old and new position
+        i = np.where(p < self.vpos)[0]
+        self.vpos[i] = p[i]                     # keep the function values
+        self.pos[i] = new_pos[i]                # and new positions
 
         self.iterations += 1
 
@@ -4,13 +4,18 @@
 #  The randomness engine class
 #
 #  RTK, 22-Mar-2022
-#  Last update:  28-Mar-2022
+#  Last update:  18-Oct-2026
 #
 ################################################################
 
 import sys
 import os
+import math
+import time
+import pickle
+import threading
 import numpy as np
+from multiprocessing import shared_memory
 
 try:
     import rdrand
@@ -18,6 +23,256 @@ try:
 except:
     haveRDRAND = False
 
+try:
+    from scipy.special import gammaincinv, betaincinv
+    haveSciPy = True
+except:
+    haveSciPy = False
+
+#  Values (or points, or bytes) skipped per jump for generators
+#  without a native jump-ahead
+JUMP = 1 << 24
+
+#  Names of the shared memory blocks served by this process
+SERVED = set()
+
+#  Seconds a shared memory client waits for its server to write
+#  more bytes before giving up
+LANE_TIMEOUT = 10.0
+
+#  Sobol direction number parameters (s, a, m_1..m_s) for dimensions
+#  2 and up from Joe and Kuo, "Constructing Sobol sequences with better
+#  two-dimensional projections", SIAM J. Sci. Comput. 30, 2635-2654 (2008)
+SOBOL_PARAMS = [
+    (1,  0, [1]),
+    (2,  1, [1,3]),
+    (3,  1, [1,3,1]),
+    (3,  2, [1,1,1]),
+    (4,  1, [1,1,3,3]),
+    (4,  4, [1,3,5,13]),
+    (5,  2, [1,1,5,5,17]),
+    (5,  4, [1,1,5,5,5]),
+    (5,  7, [1,1,7,11,19]),
+    (5, 11, [1,1,5,1,1]),
+    (5, 13, [1,1,1,3,11]),
+    (5, 14, [1,3,5,5,31]),
+    (6,  1, [1,3,3,9,7,49]),
+    (6, 13, [1,1,1,15,21,21]),
+    (6, 16, [1,3,1,13,27,49]),
+    (6, 19, [1,1,1,15,7,5]),
+    (6, 22, [1,3,1,15,13,25]),
+    (6, 25, [1,1,5,5,19,61]),
+    (7,  1, [1,3,7,11,23,15,103]),
+    (7,  4, [1,3,7,13,13,15,69]),
+]
+
+
+################################################################
+#  Prefetch
+#
+class Prefetch:
+    """Ring buffer of [0,1) values filled by a background thread"""
+
+    #-----------------------------------------------------------
+    #  __init__
+    #
+    def __init__(self, source, low=1<<16, high=1<<20, chunk=1<<16):
+        """Constructor"""
+
+        #  Fill would never wait with low at or above high
+        if (low < 0) or (low >= high):
+            raise ValueError("Prefetch watermarks must satisfy 0 <= low < high, got (%d, %d)" % (low, high))
+
+        self.source = source        # function returning a [0,1) vector of N values
+        self.low = low              # refill when this many or fewer values remain
+        self.high = high            # buffer size, refill up to this many values
+        self.chunk = min(chunk, high)  # values requested from the source at a time
+        self.buf = np.zeros(high)
+        self.head = 0               # index of the next value to serve
+        self.count = 0              # number of values in the buffer
+        self.running = True
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self.Fill, daemon=True)
+        self.thread.start()
+
+
+    #-----------------------------------------------------------
+    #  Fill
+    #
+    def Fill(self):
+        """Refill the buffer whenever it falls to the low watermark"""
+
+        while (True):
+            with self.cond:
+                while (self.running) and (self.count > self.low):
+                    self.cond.wait()
+                if (not self.running):
+                    return
+
+            #  Top up to the high watermark a chunk at a time.  Only
+            #  this thread adds values, so the free space can only grow
+            #  while the (slow) source is called without the lock.
+            while (True):
+                with self.cond:
+                    n = min(self.chunk, self.high - self.count)
+                    if (not self.running) or (n == 0):
+                        break
+                v = self.source(n)
+                with self.cond:
+                    tail = (self.head + self.count) % self.high
+                    k = min(n, self.high - tail)
+                    self.buf[tail:(tail+k)] = v[:k]
+                    self.buf[:(n-k)] = v[k:]
+                    self.count += n
+                    self.cond.notify_all()
+
+
+    #-----------------------------------------------------------
+    #  Get
+    #
+    def Get(self, N):
+        """Return a [0,1) vector of N values from the buffer"""
+
+        v = np.zeros(N)
+        i = 0
+        with self.cond:
+            while (i < N):
+                while (self.count == 0):
+                    self.cond.notify_all()
+                    self.cond.wait()
+                n = min(N-i, self.count, self.high - self.head)
+                v[i:(i+n)] = self.buf[self.head:(self.head+n)]
+                self.head = (self.head + n) % self.high
+                self.count -= n
+                i += n
+                if (self.count <= self.low):
+                    self.cond.notify_all()
+        return v
+
+
+    #-----------------------------------------------------------
+    #  Close
+    #
+    def Close(self):
+        """Stop the fill thread"""
+
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join()
+
+
+################################################################
+#  AttachShared
+#
+def AttachShared(name):
+    """Attach to an existing shared memory block without owning it"""
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        #  Before Python 3.13 attaching also registers the block to be
+        #  unlinked when this process exits, so undo that -- unless the
+        #  block was created here, or in the parent this process was
+        #  forked from, as then the registration belongs to the server
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        if (name not in SERVED):
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+################################################################
+#  EntropyServer
+#
+class EntropyServer:
+    """Serve bytes from one engine to other processes via shared memory"""
+
+    #-----------------------------------------------------------
+    #  __init__
+    #
+    #  The shared block holds a header of int64s (number of lanes,
+    #  lane size, then bytes written and bytes released per lane)
+    #  followed by one ring buffer per lane.  Each lane has one
+    #  client, so the server only advances "written" and the client
+    #  only advances "released" -- no locks needed.
+    #
+    def __init__(self, rng, nlanes=4, lane=1<<22):
+        """Constructor"""
+
+        self.rng = rng              # source engine, any mode
+        self.nlanes = nlanes        # number of clients
+        self.lane = lane            # bytes per client ring buffer
+        self.shm = shared_memory.SharedMemory(create=True, size=8*(2+2*nlanes) + nlanes*lane)
+        self.name = self.shm.name
+        SERVED.add(self.name)
+        self.hdr = np.ndarray(2+2*nlanes, dtype="int64", buffer=self.shm.buf)
+        self.hdr[:] = 0
+        self.hdr[0] = nlanes
+        self.hdr[1] = lane
+        self.data = np.ndarray((nlanes, lane), dtype="uint8", buffer=self.shm.buf, offset=8*(2+2*nlanes))
+        self.running = True
+        self.thread = threading.Thread(target=self.Fill, daemon=True)
+        self.thread.start()
+
+
+    #-----------------------------------------------------------
+    #  Kind
+    #
+    def Kind(self, k):
+        """Return the RE kind string for the client of lane k"""
+
+        return "shm:%s:%d" % (self.name, k)
+
+
+    #-----------------------------------------------------------
+    #  Bytes
+    #
+    def Bytes(self, n):
+        """Return n bytes from the source engine, whatever its mode"""
+
+        if (self.rng.disk):
+            return self.rng.FetchBytes(n)
+        return np.floor(256*self.rng.Uniform(n)).astype("uint8")
+
+
+    #-----------------------------------------------------------
+    #  Fill
+    #
+    def Fill(self):
+        """Top up any lane that is at least a quarter empty"""
+
+        while (self.running):
+            busy = False
+            for k in range(self.nlanes):
+                w = int(self.hdr[2+2*k])
+                n = self.lane - (w - int(self.hdr[3+2*k]))
+                if (n >= self.lane // 4):
+                    b = self.Bytes(n)
+                    p = w % self.lane
+                    m = min(n, self.lane - p)
+                    self.data[k, p:(p+m)] = b[:m]
+                    self.data[k, :(n-m)] = b[m:]
+                    self.hdr[2+2*k] = w + n     # publish after the bytes are in place
+                    busy = True
+            if (not busy):
+                time.sleep(0.001)
+
+
+    #-----------------------------------------------------------
+    #  Close
+    #
+    def Close(self):
+        """Stop serving and free the shared memory"""
+
+        self.running = False
+        self.thread.join()
+        self.hdr[2::2] = -1         # tell any waiting clients
+        del self.hdr, self.data
+        self.shm.close()
+        self.shm.unlink()
+        SERVED.discard(self.name)
+
 
 ################################################################
 #  RE
@@ -25,42 +280,100 @@ except:
 class RE:
     """Randomness Engine"""
 
+    #-----------------------------------------------------------
+    #  FetchBytes
+    #
+    def FetchBytes(self, nbytes):
+        """Return the next nbytes of the file as a uint8 vector"""
+
+        if (self.lane != None):
+            return self.LaneBytes(nbytes)
+
+        #  Serve a slice of the mapped file directly if there is
+        #  no wrap, otherwise index modulo the file size.  A spawned
+        #  engine wraps within its own segment, mapped back to the
+        #  file through each (start, span) it was split from.
+        size = len(self.mmap)
+        if (self.segments == []) and (self.offset + nbytes <= size):
+            b = self.mmap[self.offset:(self.offset+nbytes)]
+        else:
+            i = (self.offset + np.arange(nbytes)) % self.span
+            for start, span in reversed(self.segments):
+                i = (start + i) % span
+            if (np.all(np.diff(i) == 1)):
+                b = self.mmap[i[0]:(i[-1]+1)]
+            else:
+                b = self.mmap[i]
+        self.offset = (self.offset + nbytes) % self.span
+        return b
+
+
+    #-----------------------------------------------------------
+    #  LaneBytes
+    #
+    def LaneBytes(self, nbytes):
+        """Return the next nbytes from this client's shared memory lane"""
+
+        #  The previous request is released only now, so a returned
+        #  view stays valid until the next call
+        size = len(self.ldata)
+        self.hdr[3+2*self.lane] = self.claimed
+
+        if (nbytes > size // 2):
+            #  Collect large requests in half lanes -- the server tops up
+            #  a lane only once a quarter of it is free, so a wait for
+            #  more than three quarters of a lane might never end
+            b = np.zeros(nbytes, dtype="uint8")
+            for i in range(0, nbytes, size // 2):
+                n = min(size // 2, nbytes - i)
+                b[i:(i+n)] = self.LaneBytes(n)
+                self.hdr[3+2*self.lane] = self.claimed
+            return b
+
+        #  Wait for the server, which may have stopped
+        w = int(self.hdr[2+2*self.lane])
+        t = time.time()
+        while (w - self.claimed < nbytes):
+            if (w < 0):
+                raise ValueError("Entropy server %s has been closed" % self.shm.name)
+            if (time.time() - t > LANE_TIMEOUT):
+                raise ValueError("Entropy server %s stopped writing to lane %d" % (self.shm.name, self.lane))
+            time.sleep(0.0001)
+            if (int(self.hdr[2+2*self.lane]) != w):
+                w = int(self.hdr[2+2*self.lane])
+                t = time.time()
+
+        p = self.claimed % size
+        if (p + nbytes <= size):
+            b = self.ldata[p:(p+nbytes)]
+        else:
+            b = np.concatenate((self.ldata[p:], self.ldata[:(nbytes - (size-p))]))
+        self.claimed += nbytes
+        return b
+
+
+    #-----------------------------------------------------------
+    #  Serve
+    #
+    def Serve(self, nlanes=4, lane=1<<22):
+        """Start serving this engine's bytes to other processes"""
+
+        #  Clients use RE(kind=server.Kind(k)), one per lane
+        return EntropyServer(self, nlanes, lane)
+
+
     #-----------------------------------------------------------
     #  Fetch
     #
     def Fetch(self, N=1):
         """Fetch from a file wrapping as needed"""
 
+        #  Bytes in byte mode, otherwise [0,1) values from uint32s.
+        #  Bytes are copied, FetchBytes returns views of the mapped
+        #  file or of a lane the server reuses.
         if (self.mode == "byte"):
-            nbytes = N
-        else:
-            nbytes = 4*N  # float32 or int32
-
-        b = []
-        n = nbytes
-        while (len(b) < nbytes):
-            t = self.file.read(n)
-            if (len(t) < n):
-                n = n - len(t)
-                self.file.close()
-                self.file = open(self.kind, "rb")
-            b += t
-
-        if (self.mode == "byte"):
-            v = np.array(b, dtype="uint8")
-        else:
-            v = np.frombuffer(bytearray(b), dtype="uint32")
-            v = v / (1 << 32)
-            if (self.mode == "float"):
-                v = (self.high - self.low)*v + self.low
-            elif (self.mode == "int"):
-                v = ((self.high - self.low)*v).astype("int64") + self.low
-            elif (self.mode == "byte"):
-                v = np.floor(256*v + 0.5).astype("uint8")
-            else:
-                v = np.floor(v + 0.5).astype("uint8")
-        
-        return v
+            return np.array(self.FetchBytes(N))
+        return self.FetchBytes(4*N).view("uint32") / (1 << 32)
 
 
     #-----------------------------------------------------------
@@ -69,17 +382,42 @@ class RE:
     def MINSTD(self, N):
         """Return a [0,1) vector of N elements"""
 
+        #  Jump ahead a block at a time:  x[n+k] = (48271^k mod m)*x[n] mod m
+        #  gives exactly the same sequence as stepping one value at a time
         v = np.zeros(N)
-        for i in range(N):
-            self.seed = (48271 * self.seed) % 2147483647
-            v[i] = self.seed * 4.656612875245797e-10
+        i = 0
+        while (i < N):
+            n = min(N-i, len(self.apow))
+            x = (self.apow[:n] * (self.seed % 2147483647)) % 2147483647
+            v[i:(i+n)] = x * 4.656612875245797e-10
+            self.seed = int(x[-1])
+            i += n
         return v
 
 
+    #-----------------------------------------------------------
+    #  MINSTDPowers
+    #
+    def MINSTDPowers(self, n):
+        """Return 48271^k mod 2^31-1 for k = 1..n"""
+
+        #  Products of two values < 2^31 fit in an int64, so build
+        #  the table by repeated doubling
+        p = np.zeros(n, dtype="int64")
+        p[0] = 48271
+        k = 1
+        while (k < n):
+            m = min(k, n-k)
+            p[k:(k+m)] = (p[:m] * p[k-1]) % 2147483647
+            k += m
+        return p
+
+
     #-----------------------------------------------------------
     #  Urandom
     #
-    def Urandom(self, N):
+    @staticmethod
+    def Urandom(N):
         """Read values from urandom"""
 
         #  fetch bytes
@@ -95,7 +433,8 @@ class RE:
     #-----------------------------------------------------------
     #  RDRAND
     #
-    def RDRAND(self, N):
+    @staticmethod
+    def RDRAND(N):
         """Use rdrand module, or fall back to default_rng"""
 
         if (not haveRDRAND):
@@ -111,27 +450,141 @@ class RE:
         return v
 
 
+    #-----------------------------------------------------------
+    #  RadicalInverse
+    #
+    def RadicalInverse(self, idx, b):
+        """Return the base b van der Corput values for an array of indices"""
+
+        #  Reverse the digits of all indices at once, least
+        #  significant digit first, until every index is exhausted
+        i = np.array(idx, dtype="int64")
+        r = np.zeros(i.shape)
+        f = 1.0
+        while (i.any()):
+            f = f/b
+            r += f*(i % b)
+            i = i // b
+        return r
+
+
     #-----------------------------------------------------------
     #  Quasirandom
     #
     def Quasirandom(self, N):
         """Return a [0,1) vector of quasirandom values"""
 
-        def Halton(i,b):
-            """Return i-th Halton number for the given base"""
+        #  Halton values for qnum..qnum+N-1 in one pass
+        v = self.RadicalInverse(np.arange(self.qnum, self.qnum+N), self.base)
+        self.qnum += N
+        return v
+
+
+    #-----------------------------------------------------------
+    #  SobolDirections
+    #
+    def SobolDirections(self, d):
+        """Return a (32, d) array of Sobol direction numbers"""
+
+        if (d > len(SOBOL_PARAMS)+1):
+            raise ValueError("Sobol sequences limited to %d dimensions" % (len(SOBOL_PARAMS)+1))
+
+        V = np.zeros((32, d), dtype="uint64")
+        V[:,0] = [1 << (31-j) for j in range(32)]
+
+        for k in range(1, d):
+            s, a, m = SOBOL_PARAMS[k-1]
+            v = [m[j] << (31-j) for j in range(s)]
+            for j in range(s, 32):
+                t = v[j-s] ^ (v[j-s] >> s)
+                for i in range(1, s):
+                    if ((a >> (s-1-i)) & 1):
+                        t ^= v[j-i]
+                v.append(t)
+            V[:,k] = v
+        return V
+
+
+    #-----------------------------------------------------------
+    #  Sobol
+    #
+    def Sobol(self, N):
+        """Return an (N, dim) block of Sobol points"""
+
+        #  Point i is the XOR of the direction numbers selected by
+        #  the bits of the Gray code of i
+        i = np.arange(self.qnum, self.qnum+N, dtype="uint64")
+        g = i ^ (i >> np.uint64(1))
+        x = np.zeros((N, self.dim), dtype="uint64")
+        j = 0
+        while (g.any()):
+            x ^= ((g & np.uint64(1))[:,None] * self.V[j])
+            g = g >> np.uint64(1)
+            j += 1
+        self.qnum += N
+        return x / (1 << 32)
+
+
+    #-----------------------------------------------------------
+    #  HaltonPermutations
+    #
+    def HaltonPermutations(self):
+        """Set up the prime bases and digit scrambles from the seed"""
+
+        #  Sieve up to a bound on the dim-th prime
+        n = max(self.dim, 6)
+        m = int(n*(np.log(n) + np.log(np.log(n)))) + 1
+        sieve = np.ones(m+1, dtype="bool")
+        sieve[:2] = False
+        for p in range(2, int(m**0.5)+1):
+            if (sieve[p]):
+                sieve[p*p::p] = False
+        self.primes = np.nonzero(sieve)[0][:self.dim].tolist()
+
+        #  One linear scramble, d -> (a*d + c) mod b with a != 0, per
+        #  digit position, enough digits for double precision in each
+        #  base.  Each is a permutation of the digits but needs only
+        #  two numbers, not b, so high dimensions stay cheap.
+        g = np.random.Generator(np.random.PCG64(self.seed))
+        self.perms = []
+        for b in self.primes:
+            ndigits = int(np.ceil(53*np.log(2)/np.log(b)))
+            self.perms.append((g.integers(1, b, size=ndigits), g.integers(0, b, size=ndigits)))
+
+
+    #-----------------------------------------------------------
+    #  ScrambledHalton
+    #
+    def ScrambledHalton(self, N):
+        """Return an (N, dim) block of scrambled Halton points"""
+
+        #  Each dimension uses the next prime base with every digit
+        #  position passed through its own random scramble
+        i = np.arange(self.qnum, self.qnum+N, dtype="int64")
+        v = np.zeros((N, self.dim))
+        for k in range(self.dim):
+            b = self.primes[k]
+            a, c = self.perms[k]
+            n = i.copy()
             f = 1.0
-            r = 0
-            while (i > 0):
+            for j in range(len(a)):
                 f = f/b
-                r = r + f*(i % b)
-                i = np.floor(i/float(b))
-            return r
+                if (n[-1] > 0):
+                    v[:,k] += f*((a[j]*(n % b) + c[j]) % b)
+                    n = n // b
+                else:
+                    v[:,k] += f*c[j]  # only leading zeros left
+        self.qnum += N
+        return v
+
+
+    #-----------------------------------------------------------
+    #  Skip
+    #
+    def Skip(self, n):
+        """Skip ahead n points in a quasirandom sequence"""
 
-        v = []
-        while (len(v) < N):
-            v.append(Halton(self.qnum, self.base))
-            self.qnum += 1
-        return np.array(v)
+        self.qnum += n
 
 
     #-----------------------------------------------------------
@@ -143,36 +596,591 @@ class RE:
         return self.g.random(N)
 
 
+    #-----------------------------------------------------------
+    #  Child
+    #
+    def Child(self, seed=None, offset=0):
+        """Return a new engine like this one with the given seed"""
+
+        return RE(mode=self.mode, kind=self.kind, seed=seed, low=self.low, high=self.high,
+                  base=self.base, dim=self.dim, offset=offset, prefetch=self.prefetch)
+
+
+    #-----------------------------------------------------------
+    #  jumped
+    #
+    #  Without a native jump-ahead a jump is JUMP (2^24, about 16.7
+    #  million) values, points, or bytes.  An engine and the one k
+    #  jumps ahead overlap once the first has drawn JUMP*k values,
+    #  so use spawn for longer independent runs.
+    #
+    def jumped(self, k=1):
+        """Return a new engine k jumps ahead of this one"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            #  Native jump-ahead of the bit generator
+            c = self.Child(self.ss)
+            c.g = np.random.Generator(self.g.bit_generator.jumped(k))
+        elif (self.kind == "minstd"):
+            #  k*JUMP steps of the LCG is a single multiply
+            if ((k+1)*JUMP > self.span):
+                raise ValueError("MINSTD stream of %d values too short for %d jumps, use spawn" % (self.span, k))
+            c = self.Child((pow(48271, k*JUMP, 2147483647) * self.seed) % 2147483647)
+            c.span = JUMP
+        elif (self.kind == "quasi") or (self.kind == "sobol"):
+            c = self.Child(self.qnum + k*JUMP)
+        elif (self.kind == "halton"):
+            c = self.Child(self.seed)
+            c.qnum = self.qnum + k*JUMP
+        elif (self.lane != None):
+            raise ValueError("Shared memory clients cannot be jumped or spawned, use another lane")
+        elif (self.disk):
+            #  Jumps must stay inside this engine's part of the file,
+            #  wrapping around would replay another engine's bytes
+            if ((k+1)*JUMP > self.span):
+                raise ValueError("File segment of %d bytes too small for %d jumps, use spawn" % (self.span, k))
+            c = self.Child()
+            c.segments = self.segments + [((self.offset + k*JUMP) % self.span, self.span)]
+            c.offset, c.span = 0, JUMP
+        else:
+            #  urandom and rdrand need no jump
+            c = self.Child()
+        return c
+
+
+    #-----------------------------------------------------------
+    #  spawn
+    #
+    #  minstd and file engines split their share of the period or
+    #  file into n+1 equal parts, keeping the first, so each stream
+    #  holds span values or bytes (file streams then wrap within
+    #  their own part).  Quasirandom kinds are spaced JUMP points
+    #  apart, so each stream has 2^24 points before it reaches the
+    #  next.
+    #
+    def spawn(self, n):
+        """Return a list of n independent engines"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            return [self.Child(s) for s in self.ss.spawn(n)]
+
+        if (self.kind == "minstd"):
+            #  Split what is left of this engine's share of the period
+            #  into n+1 equal streams, keeping the first
+            step = self.span // (n+1)
+            if (step < 1):
+                raise ValueError("MINSTD stream of %d values too short to spawn %d engines" % (self.span, n))
+            c = []
+            for i in range(n):
+                c.append(self.Child((pow(48271, (i+1)*step, 2147483647) * self.seed) % 2147483647))
+                c[-1].span = step
+            self.span = step
+            self.nspawn += n
+            return c
+
+        if (self.disk) and (self.lane == None):
+            #  Split this engine's part of the file into n+1 equal
+            #  segments starting at the current offset, keeping the first
+            step = self.span // (n+1)
+            if (step == 0):
+                raise ValueError("File segment of %d bytes too small to spawn %d engines" % (self.span, n))
+            c = []
+            for i in range(n):
+                c.append(self.Child())
+                c[-1].segments = self.segments + [((self.offset + (i+1)*step) % self.span, self.span)]
+                c[-1].offset, c[-1].span = 0, step
+            self.segments = self.segments + [(self.offset, self.span)]
+            self.offset, self.span = 0, step
+            self.nspawn += n
+            return c
+
+        #  Otherwise, consecutive jumps not handed out before
+        c = [self.jumped(self.nspawn + i + 1) for i in range(n)]
+        self.nspawn += n
+        return c
+
+
+    #-----------------------------------------------------------
+    #  getstate
+    #
+    def getstate(self):
+        """Return the current position in the stream as a dictionary"""
+
+        state = {"kind": self.kind, "nspawn": self.nspawn}
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            state["bit_generator"] = self.g.bit_generator.state
+            state["entropy"] = self.ss.entropy
+            state["spawn_key"] = self.ss.spawn_key
+            state["n_children_spawned"] = self.ss.n_children_spawned
+        elif (self.kind == "minstd"):
+            state["seed"] = int(self.seed)
+            state["span"] = int(self.span)
+        elif (self.kind == "quasi") or (self.kind == "sobol"):
+            state["qnum"] = int(self.qnum)
+        elif (self.kind == "halton"):
+            state["seed"] = int(self.seed)
+            state["qnum"] = int(self.qnum)
+        elif (self.disk):
+            state["offset"] = int(self.offset)
+            state["span"] = int(self.span)
+            state["segments"] = [(int(a), int(b)) for a, b in self.segments]
+
+        return state
+
+
+    #-----------------------------------------------------------
+    #  setstate
+    #
+    def setstate(self, state):
+        """Restore a position returned by getstate"""
+
+        if (state["kind"] != self.kind):
+            raise ValueError("State is for kind %s, not %s" % (state["kind"], self.kind))
+
+        self.nspawn = state["nspawn"]
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            self.ss = np.random.SeedSequence(state["entropy"], spawn_key=state["spawn_key"],
+                                             n_children_spawned=state["n_children_spawned"])
+            self.g.bit_generator.state = state["bit_generator"]
+        elif (self.kind == "minstd"):
+            self.seed = state["seed"]
+            self.span = state.get("span", self.span)
+        elif (self.kind == "quasi") or (self.kind == "sobol"):
+            self.qnum = state["qnum"]
+        elif (self.kind == "halton"):
+            if (state["seed"] != self.seed):
+                self.seed = state["seed"]
+                self.HaltonPermutations()
+            self.qnum = state["qnum"]
+        elif (self.disk):
+            self.offset = state["offset"]
+            self.span = state.get("span", self.span)
+            self.segments = [tuple(x) for x in state.get("segments", self.segments)]
+
+
+    #-----------------------------------------------------------
+    #  dumps
+    #
+    def dumps(self):
+        """Return the current state as bytes"""
+
+        return pickle.dumps(self.getstate(), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+    #-----------------------------------------------------------
+    #  loads
+    #
+    def loads(self, b):
+        """Restore a state returned by dumps"""
+
+        self.setstate(pickle.loads(b))
+
+
+    #-----------------------------------------------------------
+    #  Uniform
+    #
+    def Uniform(self, N):
+        """Return a [0,1) vector of N values regardless of mode"""
+
+        if (self.disk):
+            return self.FetchBytes(4*N).view("uint32") / (1 << 32)
+        if (self.kind == "sobol") or (self.kind == "halton"):
+            #  use consecutive points, component by component
+            return self.generators[self.kind](-(-N // self.dim)).ravel()[:N]
+        return self.generators[self.kind](N)
+
+
+    #-----------------------------------------------------------
+    #  NormalQuantile
+    #
+    def NormalQuantile(self, u):
+        """Inverse standard normal CDF (Acklam's approximation)"""
+
+        a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+              1.383577518672690e+02,-3.066479806614716e+01, 2.506628277459239e+00]
+        b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+              6.680131188771972e+01,-1.328068155288572e+01]
+        c = [-7.784894002430293e-03,-3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00,  2.938163982698783e+00]
+        d = [ 7.784695709041462e-03, 3.224671290700398e-01,  2.445134137142996e+00,
+              3.754408661907416e+00]
+
+        u = np.clip(u, 2.0**-53, 1 - 2.0**-53)
+        v = np.zeros(len(u))
+
+        #  Central region
+        i = (u >= 0.02425) & (u <= 0.97575)
+        q = u[i] - 0.5
+        r = q*q
+        v[i] = (((((a[0]*r+a[1])*r+a[2])*r+a[3])*r+a[4])*r+a[5])*q /  \
+               (((((b[0]*r+b[1])*r+b[2])*r+b[3])*r+b[4])*r+1)
+
+        #  Tails, by symmetry
+        i = ~i
+        t = np.minimum(u[i], 1 - u[i])
+        q = np.sqrt(-2*np.log(t))
+        x = (((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) /  \
+             ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1)
+        v[i] = np.where(u[i] < 0.5, x, -x)
+        return v
+
+
+    #-----------------------------------------------------------
+    #  normal
+    #
+    def normal(self, N=1, mu=0, sigma=1):
+        """Return a vector of N(mu,sigma) samples"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            #  NumPy's ziggurat
+            v = self.g.standard_normal(N)
+        elif (self.kind == "quasi"):
+            #  Successive quasirandom values are far from independent,
+            #  so use one value per sample through the inverse CDF
+            v = self.NormalQuantile(self.Uniform(N))
+        else:
+            #  Batched polar method, rejecting pairs outside the unit circle
+            v = np.zeros(N)
+            n = 0
+            while (n < N):
+                m = N - n
+                u = 2*self.Uniform(2*(m//2 + m//8 + 8)) - 1
+                x, y = u[0::2], u[1::2]
+                s = x*x + y*y
+                i = np.where((s > 0) & (s < 1))[0]
+                f = np.sqrt(-2*np.log(s[i])/s[i])
+                z = np.concatenate((x[i]*f, y[i]*f))[:m]
+                v[n:(n+len(z))] = z
+                n += len(z)
+        v = sigma*v + mu
+        return v[0] if (N == 1) else v
+
+
+    #-----------------------------------------------------------
+    #  exponential
+    #
+    def exponential(self, N=1, scale=1):
+        """Return a vector of exponential samples with the given mean"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            v = self.g.standard_exponential(N)
+        else:
+            v = -np.log1p(-self.Uniform(N))  # inverse CDF, 1-u in (0,1]
+        v = scale*v
+        return v[0] if (N == 1) else v
+
+
+    #-----------------------------------------------------------
+    #  cauchy
+    #
+    def cauchy(self, N=1, loc=0, scale=1):
+        """Return a vector of Cauchy samples"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            v = self.g.standard_cauchy(N)
+        else:
+            v = np.tan(np.pi*(self.Uniform(N) - 0.5))  # inverse CDF
+        v = scale*v + loc
+        return v[0] if (N == 1) else v
+
+
+    #-----------------------------------------------------------
+    #  gamma
+    #
+    def gamma(self, N=1, shape=1, scale=1):
+        """Return a vector of gamma samples"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            v = self.g.standard_gamma(shape, N)
+        elif (self.kind == "quasi"):
+            #  Rejection needs independent draws, so use one value
+            #  per sample through the inverse CDF, as normal does
+            if (not haveSciPy):
+                raise ValueError("Quasirandom gamma and beta samples need scipy")
+            v = gammaincinv(shape, self.Uniform(N))
+        else:
+            #  Marsaglia and Tsang, batched.  For shape < 1 boost
+            #  with Gamma(a) = Gamma(a+1)*U^(1/a).
+            a = shape if (shape >= 1) else shape + 1
+            d = a - 1/3
+            c = 1/np.sqrt(9*d)
+            v = np.zeros(N)
+            n = 0
+            while (n < N):
+                m = N - n + 8
+                z = self.normal(m) if (m > 1) else np.array([self.normal()])
+                u = self.Uniform(m)
+                t = (1 + c*z)**3
+                ok = (t > 0)
+                ok[ok] = np.log(u[ok]) < 0.5*z[ok]**2 + d - d*t[ok] + d*np.log(t[ok])
+                g = (d*t[ok])[:(N-n)]
+                v[n:(n+len(g))] = g
+                n += len(g)
+            if (shape < 1):
+                v *= self.Uniform(N)**(1/shape)
+        v = scale*v
+        return v[0] if (N == 1) else v
+
+
+    #-----------------------------------------------------------
+    #  beta
+    #
+    def beta(self, N=1, a=1, b=1):
+        """Return a vector of beta samples"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            v = self.g.beta(a, b, N)
+        elif (self.kind == "quasi"):
+            #  One value per sample through the inverse CDF
+            if (not haveSciPy):
+                raise ValueError("Quasirandom gamma and beta samples need scipy")
+            v = betaincinv(a, b, self.Uniform(N))
+        else:
+            x = self.gamma(N, a)
+            y = self.gamma(N, b)
+            if (N == 1):
+                x, y = np.array([x]), np.array([y])
+            v = x / (x + y)
+        return v[0] if (N == 1) else v
+
+
+    #-----------------------------------------------------------
+    #  binomial
+    #
+    def binomial(self, N=1, n=1, p=0.5):
+        """Return a vector of binomial samples"""
+
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            v = self.g.binomial(n, p, N)
+        else:
+            #  Invert the CDF, one uniform per sample
+            k = np.arange(n+1)
+            lg = np.frompyfunc(math.lgamma, 1, 1)
+            lp = lg(n+1) - lg(k+1) - lg(n-k+1)
+            lp = lp.astype("float64")
+            if (0 < p < 1):
+                lp += k*np.log(p) + (n-k)*np.log1p(-p)
+                cdf = np.cumsum(np.exp(lp))
+            else:
+                cdf = (k >= n*p).astype("float64")
+            v = np.searchsorted(cdf, self.Uniform(N), side="right")
+            v = np.minimum(v, n)
+        return v[0] if (N == 1) else v
+
+
+    #-----------------------------------------------------------
+    #  Process
+    #
+    def Process(self, v, out=None, dtype=None, packed=False):
+        """Map a [0,1) vector to the output mode in place"""
+
+        if (self.mode == "float"):
+            v *= (self.high - self.low)
+            v += self.low
+            t = "float64"
+        elif (self.mode == "int"):
+            v *= (self.high - self.low)
+            t = "int64"
+        elif (self.mode == "byte"):
+            v *= 256
+            v += 0.5
+            np.floor(v, out=v)
+            t = "uint8"
+        else:
+            v += 0.5
+            np.floor(v, out=v)
+            t = "uint8"
+
+        if (packed) and (self.mode == "bit"):
+            #  eight bits per byte
+            v = np.packbits(v.astype("uint8"))
+
+        #  Cast once, into the caller's buffer if given
+        if (out is None):
+            out = v.astype(t if (dtype is None) else dtype, copy=False)
+        else:
+            out[...] = v
+
+        if (self.mode == "int"):
+            out += self.low
+        return out
+
+
+    #-----------------------------------------------------------
+    #  Words
+    #
+    def Words(self, N):
+        """Return N raw uint64 words from a file or urandom"""
+
+        if (self.disk):
+            return np.array(self.FetchBytes(8*N)).view("uint64")
+        if (self.pool != None):
+            #  Prefetched values are exact uint32/2^32, two per word
+            u = (self.pool.Get(2*N) * (1 << 32)).astype("uint64")
+            return (u[0::2] << np.uint64(32)) | u[1::2]
+        return np.frombuffer(os.urandom(8*N), dtype="uint64")
+
+
+    #-----------------------------------------------------------
+    #  Lemire
+    #
+    #  Lemire, "Fast random integer generation in an interval", ACM
+    #  TOMACS 29(1), 2019.  The high word of the 128-bit product x*r
+    #  is the value in [0,r), and the low word rejects the few x that
+    #  would bias it, so the result is exact for any 64-bit range.
+    #
+    def Lemire(self, N):
+        """Return N unbiased integers in [low,high) from raw words"""
+
+        r = int(self.high) - int(self.low)
+        t = np.uint64((2**64 - r) % r)  # reject low words below this
+        m = np.uint64(0xffffffff)
+        s = np.uint64(32)
+        rl, rh = np.uint64(r & 0xffffffff), np.uint64(r >> 32)
+
+        v = np.zeros(N, dtype="int64")
+        i = 0
+        while (i < N):
+            #  x*r from 32-bit halves, as NumPy has no 128-bit type
+            x = self.Words(N-i)
+            xl, xh = x & m, x >> s
+            ll, lh, hl = xl*rl, xl*rh, xh*rl
+            mid = (ll >> s) + (lh & m) + (hl & m)
+            lo = (ll & m) | (mid << s)
+            hi = xh*rh + (lh >> s) + (hl >> s) + (mid >> s)
+            hi = hi[lo >= t]
+            n = min(len(hi), N-i)
+            v[i:(i+n)] = hi[:n]
+            i += n
+
+        v += int(self.low)
+        return v
+
+
+    #-----------------------------------------------------------
+    #  Integers
+    #
+    def Integers(self, N):
+        """Return N int64 values in [low,high)"""
+
+        #  Native bounded integers for NumPy generators (also Lemire's
+        #  method), raw words for files and urandom.  Other kinds keep
+        #  scaling their [0,1) values, e.g. to stay quasirandom.  N.B.
+        #  files use 8 bytes per value, plus any rejected words.
+        if (int(self.high) - int(self.low) <= 1):
+            #  Only one possible value (or an empty range), as before
+            return np.full(N, int(self.low), dtype="int64")
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            return self.g.integers(int(self.low), int(self.high), size=N, dtype="int64")
+        if (self.disk) or (self.kind == "urandom"):
+            return self.Lemire(N)
+        return self.Process(self.generators[self.kind](N))
+
+
     #-----------------------------------------------------------
     #  random
     #
-    def random(self, N=1):
+    def random(self, N=1, out=None, dtype=None, packed=False):
         """Return a vector of N values"""
-    
-        if (not self.disk):
-            #  Get a [0,1) vector
-            v = self.generators[self.kind](N)
-
-            #  Process
-            if (self.mode == "float"):
-                v = (self.high - self.low)*v + self.low
-            elif (self.mode == "int"):
-                v = ((self.high - self.low)*v).astype("int64") + self.low
-            elif (self.mode == "byte"):
-                v = np.floor(256*v + 0.5).astype("uint8")
+
+        #  out:    optional buffer to fill and return
+        #  dtype:  output type if not the mode's default (ignored if out given)
+        #  packed: in "bit" mode, return the bits packed eight per byte
+
+        if (out is not None):
+            dtype = out.dtype
+
+        if ((self.kind == "pcg64") or (self.kind == "mt19937")) and (self.mode == "float") and \
+           (dtype is not None) and (np.dtype(dtype) in (np.float32, np.float64)):
+            #  Fill directly from the generator and scale in place
+            v = self.g.random(N if (out is None) else None, dtype=dtype, out=out)
+            v *= (self.high - self.low)
+            v += self.low
+        elif (self.mode == "int"):
+            #  Integers directly, no float round trip where possible
+            v = self.Integers(N)
+            if (out is not None):
+                out[...] = v
+                v = out
+            elif (dtype is not None):
+                v = v.astype(dtype)
+        elif (self.disk) and (self.mode == "byte"):
+            #  Bytes straight from the file, copied once into out, a
+            #  new dtype, or a fresh writable array
+            v = self.FetchBytes(N)
+            if (out is not None):
+                out[...] = v
+                v = out
             else:
-                v = np.floor(v + 0.5).astype("uint8")
+                v = np.array(v, dtype=dtype)
         else:
-            #  From a disk file
-            v = self.Fetch(N)
+            #  Get a [0,1) vector and process
+            if (self.disk):
+                v = self.Fetch(N)
+            else:
+                v = self.generators[self.kind](N)
+            v = self.Process(v, out, dtype, packed)
+
+        return v[0] if (N == 1) and (out is None) else v 
+
+
+    #-----------------------------------------------------------
+    #  stream
+    #
+    def stream(self, chunk=65536):
+        """Yield values one at a time, generated chunk values at a time"""
+
+        #  N.B. the engine runs up to chunk values ahead of what has
+        #  been consumed, e.g. for getstate
+        points = (self.kind == "sobol") or (self.kind == "halton")
+        while (True):
+            v = self.random(chunk)
+            if (points):
+                yield from np.reshape(v, (chunk, self.dim))  # one point per item
+            else:
+                yield from np.atleast_1d(v).tolist()  # Python scalars are cheapest to hand out
+
+
+    #-----------------------------------------------------------
+    #  __iter__
+    #
+    def __iter__(self):
+        """Iterate over the values using the default chunk size"""
 
-        return v[0] if (N == 1) else v 
+        return self.stream()
+
+
+    #-----------------------------------------------------------
+    #  Close
+    #
+    def Close(self):
+        """Stop any prefetch thread and detach from shared memory"""
+
+        if (getattr(self, "pool", None) != None):
+            self.pool.Close()
+            self.pool = None
+            self.generators[self.kind] = {"urandom": self.Urandom, "rdrand": self.RDRAND}[self.kind]
+        if (getattr(self, "lane", None) != None):
+            del self.hdr, self.ldata
+            self.shm.close()
+            self.lane = None
+
+
+    #-----------------------------------------------------------
+    #  __del__
+    #
+    def __del__(self):
+        """Release resources when the engine is collected"""
+
+        self.Close()
 
 
     #-----------------------------------------------------------
     #  __init__
     #
-    def __init__(self, mode="float", kind="pcg64", seed=None, low=0, high=1, base=2):
+    def __init__(self, mode="float", kind="pcg64", seed=None, low=0, high=1, base=2, dim=2, offset=0, prefetch=None):
         """Constructor"""
 
         #  Generators
@@ -183,25 +1191,42 @@ class RE:
             "quasi"  : self.Quasirandom,
             "urandom": self.Urandom,
             "rdrand" : self.RDRAND,
+            "sobol"  : self.Sobol,
+            "halton" : self.ScrambledHalton,
         }
 
         #  Keep arguments
         self.mode = mode            # output type: "float", "int", "byte", "bit"
-        self.kind = kind            # generator type: "pcg64", "mt19937", "minstd", "quasi", "urandom", "rdrand" | filename
+        self.kind = kind            # generator type: "pcg64", "mt19937", "minstd", "quasi", "sobol", "halton", "urandom", "rdrand" | filename
         self.seed = seed            # integer seed or nothing
         self.low  = low             # minimum output value (inclusive)
         self.high = high            # maximum output value (exclusive)
         self.base = base            # quasirandom base (must be a prime)
+        self.dim  = dim             # dimensions per point for "sobol" and "halton"
         self.disk = False           # True if reading a file
+        self.lane = None            # lane number if a shared memory client
+        self.offset = offset        # starting byte offset when reading a file
+        self.span = 0               # values (minstd) or file bytes this engine may use
+        self.segments = []          # (start, span) of each file split, outermost first
+        self.pool = None            # background buffer for "urandom" and "rdrand"
+        self.prefetch = prefetch    # prefetch setting passed to spawned engines
+        self.nspawn = 0             # number of jumped engines handed out by spawn
 
         #  Configure generator
-        if (self.kind == "pcg64"):
-            self.g = np.random.Generator(np.random.PCG64(seed))
-        elif (self.kind == "mt19937"):
-            self.g = np.random.Generator(np.random.MT19937(seed))
+        if (self.kind == "pcg64") or (self.kind == "mt19937"):
+            if (isinstance(seed, np.random.SeedSequence)):
+                self.ss = seed
+            else:
+                self.ss = np.random.SeedSequence(seed)  # same stream as passing seed
+            if (self.kind == "pcg64"):
+                self.g = np.random.Generator(np.random.PCG64(self.ss))
+            else:
+                self.g = np.random.Generator(np.random.MT19937(self.ss))
         elif (self.kind == "minstd"):
             if (seed == None):
                 self.seed = np.random.randint(1,93123544)
+            self.apow = self.MINSTDPowers(65536)  # jump-ahead multipliers
+            self.span = 2147483646      # the full period
         elif (self.kind == "quasi"):
             if (seed == None):
                 self.qnum = 0  # for quasirandom numbers in order
@@ -209,10 +1234,46 @@ class RE:
                 self.qnum = np.random.randint(0,10000)
             else:
                 self.qnum = seed
+        elif (self.kind == "sobol"):
+            self.V = self.SobolDirections(dim)
+            if (seed == None):
+                self.qnum = 0  # starting index, as for "quasi"
+            elif (seed < 0):
+                self.qnum = np.random.randint(0,10000)
+            else:
+                self.qnum = seed
+        elif (self.kind == "halton"):
+            #  seed selects the digit scrambling, start at the beginning
+            if (seed == None):
+                self.seed = np.random.randint(0,2147483647)
+            self.qnum = 0
+            self.HaltonPermutations()
         elif (self.kind == "urandom") or (self.kind == "rdrand"):
-            pass
+            #  prefetch is True or (low, high) watermarks, in values.  The
+            #  sources are static methods, so the fill thread does not keep
+            #  this engine alive and __del__ can stop it.
+            source = self.generators[self.kind]
+            if (prefetch == True):
+                self.pool = Prefetch(source)
+            elif (prefetch):
+                self.pool = Prefetch(source, low=prefetch[0], high=prefetch[1])
+            if (self.pool != None):
+                self.generators[self.kind] = self.pool.Get
+        elif (self.kind.startswith("shm:")):
+            #  Client of an EntropyServer, "shm:<name>:<lane>"
+            self.disk = True
+            name, k = self.kind[4:].rsplit(":", 1)
+            self.shm = AttachShared(name)
+            nlanes, size = np.ndarray(2, dtype="int64", buffer=self.shm.buf)
+            self.hdr = np.ndarray(2+2*nlanes, dtype="int64", buffer=self.shm.buf)
+            self.lane = int(k)
+            self.ldata = np.ndarray(size, dtype="uint8", buffer=self.shm.buf,
+                                    offset=8*(2+2*nlanes) + self.lane*size)
+            self.claimed = int(self.hdr[3+2*self.lane])
         else:
             self.disk = True
-            self.file = open(self.kind, "rb")
+            self.mmap = np.memmap(self.kind, dtype="uint8", mode="r")
+            self.offset = offset % len(self.mmap)
+            self.span = len(self.mmap)
 
 
@@ -56,6 +56,8 @@ if (len(sys.argv) == 3):
 else:
     rng = RE(mode='int', low=0, high=n)
 
+values = rng.stream()  # values one at a time, generated in chunks
+
 done = False
 
 def Done():
@@ -67,7 +69,7 @@ tu.listen()
 
 c = 0
 while (not done):
-    k = rng.random()
+    k = next(values)
     x = r*(x + X[k])
     y = r*(y + Y[k])
     if (c > 2*n):
@@ -30,6 +30,8 @@ if (len(sys.argv) == 2):
 else:
     rng = RE(mode='int', low=0, high=3)
 
+values = rng.stream()  # values one at a time, generated in chunks
+
 done = False
 
 def Done():
@@ -40,7 +42,7 @@ tu.onkeypress(Done)
 tu.listen()
 
 while (not done):
-    n = rng.random()
+    n = next(values)
     x = 0.5*(x + X[n])
     y = 0.5*(y + Y[n])
     tu.color(colors[n])
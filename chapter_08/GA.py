@@ -31,9 +31,11 @@ class GA:
                  init=None,       # swarm initialization object (subclass Initializer)
                  done=None,       # custom Done object (subclass Done)
                  bounds=None,     # swarm bounds object
+                 evaluator=None,  # batch evaluator backend (e.g. ParallelEvaluator)
                  rng=None):       # randomness source
 
         self.obj = obj
+        self.evaluator = evaluator
         self.npart = npart
         self.ndim = ndim
         self.max_iter = max_iter
@@ -124,6 +126,13 @@ class GA:
     def Evaluate(self, pos):
         """Evaluate a set of positions"""
 
+        #  Score the whole swarm in one call if the evaluator
+        #  backend or the objective can
+        if (self.evaluator != None):
+            return self.evaluator.EvaluateBatch(pos)
+        if (hasattr(self.obj, "EvaluateBatch")):
+            return np.asarray(self.obj.EvaluateBatch(pos), dtype="float64")
+
         p = np.zeros(self.npart)
         for i in range(self.npart):
             p[i] = self.obj.Evaluate(pos[i])
@@ -172,17 +181,38 @@ class GA:
     def Evolve(self):
         """Evolve the swarm"""
 
+        #  A whole generation at once:  partners come from the
+        #  current population, every particle but the best one may
+        #  change (elitism)
         idx = np.argsort(self.vpos)
-
-        for k,i in enumerate(idx):
-            if (k == 0):
-                continue    #  leave the best one alone
-            if (self.rng.random() < self.CR):
-                #  Breed this one with one of the better particles
-                self.Crossover(i, idx)
-            if (self.rng.random() < self.F):
-                #  Random mutation
-                self.Mutate(i)
+        a = idx[1:]
+        r = np.arange(1, self.npart)        # rank of each particle in a
+        n = len(a)
+        u = np.reshape(self.rng.random(6*n), (6,n))
+
+        #  Breed with one of the better particles, not itself:  draw
+        #  from the top set less this particle, then step over it
+        top = int(self.top*self.npart)
+        inside = (r < top)
+        k = ((top - inside)*u[1]).astype("int64")
+        k += (inside & (k >= r))
+        b = idx[k]
+
+        #  Crossover at a random cut-off position, one masked assignment
+        d = (self.ndim*u[2]).astype("int64")
+        cross = (u[0] < self.CR)[:,np.newaxis] & (np.arange(self.ndim) >= d[:,np.newaxis])
+        self.pos[a] = np.where(cross, self.pos[b], self.pos[a])
+
+        #  Random mutation of one component
+        m = np.where(u[3] < self.F)[0]
+        j = (self.ndim*u[4][m]).astype("int64")
+        if (self.bounds != None):
+            lower = self.bounds.lower[j]
+            upper = self.bounds.upper[j]
+        else:
+            lower = self.pos.min(axis=0)[j]
+            upper = self.pos.max(axis=0)[j]
+        self.pos[a[m], j] = lower + u[5][m]*(upper-lower)
 
         if (self.bounds != None):
             self.pos = self.bounds.Limits(self.pos)
@@ -197,13 +227,14 @@ class GA:
         self.Evolve()                               # evolve the swarm
         self.vpos = self.Evaluate(self.pos)         # and evaluate the new positions
 
-        #  For each particle
-        for i in range(self.npart):
-            if (self.vpos[i] < self.gbest[-1]):         # is new position global best?
-                self.gbest.append(self.vpos[i])         # new position is new swarm best
-                self.gpos.append(self.pos[i].copy())    # keep the position
-                self.gidx.append(i)                     # particle number
-                self.giter.append(self.iterations)      # and when it happened
+        #  New swarm bests, in particle order, each one better than
+        #  the swarm best or any earlier particle this step
+        prev = np.minimum.accumulate(np.concatenate(([self.gbest[-1]], self.vpos)))[:-1]
+        for i in np.where(self.vpos < prev)[0]:
+            self.gbest.append(self.vpos[i])         # new position is new swarm best
+            self.gpos.append(self.pos[i].copy())    # keep the position
+            self.gidx.append(i)                     # particle number
+            self.giter.append(self.iterations)      # and when it happened
 
         self.iterations += 1
 
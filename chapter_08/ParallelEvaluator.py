@@ -0,0 +1,113 @@
+#
+#  file:  ParallelEvaluator.py
+#
+#  Evaluate swarm positions across a pool of processes for
+#  expensive objective functions.
+#  Python 3.X
+#
+#  RTK, 18-Oct-2026
+#  Last update:  18-Oct-2026
+#
+################################################################
+
+import os
+import sys
+import multiprocessing as mp
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+#  The objective function in each worker process
+worker_obj = None
+
+
+################################################################
+#  WorkerInit
+#
+def WorkerInit(obj):
+    """Keep the objective function for this worker"""
+
+    global worker_obj
+    worker_obj = obj
+
+
+################################################################
+#  WorkerEvaluate
+#
+def WorkerEvaluate(pos):
+    """Evaluate a block of positions in a worker"""
+
+    if (hasattr(worker_obj, "EvaluateBatch")):
+        return np.asarray(worker_obj.EvaluateBatch(pos), dtype="float64").tolist()
+    return [worker_obj.Evaluate(p) for p in pos]
+
+
+################################################################
+#  ParallelEvaluator
+#
+class ParallelEvaluator:
+    """Evaluate positions in parallel with a process pool"""
+
+    #-----------------------------------------------------------
+    #  __init__
+    #
+    #  The objective is handed to each worker once, when the worker
+    #  starts, so images, training data, etc. are not pickled with
+    #  every call.  On Linux the workers are forked by default, so
+    #  they share the parent's copy of the data and scripts without a
+    #  __main__ guard still work.  Elsewhere (e.g. macOS, where fork
+    #  is unsafe) the platform default is used.  Pass start="spawn"
+    #  if the parent runs threads, e.g. RE prefetching or an
+    #  EntropyServer, as forking those can deadlock.
+    #
+    def __init__(self, obj,       # the objective function (subclass Objective)
+                 workers=None,    # number of worker processes (None == all CPUs)
+                 start=None):     # multiprocessing start method (None == see above)
+        """Constructor"""
+
+        self.obj = obj
+        self.workers = os.cpu_count() if (workers == None) else workers
+        if (start == None) and (sys.platform.startswith("linux")):
+            start = "fork"
+        ctx = mp.get_context(start)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                        initializer=WorkerInit, initargs=(obj,))
+
+
+    #-----------------------------------------------------------
+    #  Evaluate
+    #
+    def Evaluate(self, p):
+        """Evaluate a single position in this process"""
+
+        return self.obj.Evaluate(p)
+
+
+    #-----------------------------------------------------------
+    #  EvaluateBatch
+    #
+    def EvaluateBatch(self, pos):
+        """Evaluate a set of positions, one block per worker"""
+
+        blocks = np.array_split(pos, min(self.workers, len(pos)))
+        v = []
+        for b in self.pool.map(WorkerEvaluate, blocks):
+            v += b
+
+        #  The workers counted on their own copies
+        if (hasattr(self.obj, "fcount")):
+            self.obj.fcount += len(pos)
+
+        return np.array(v, dtype="float64")
+
+
+    #-----------------------------------------------------------
+    #  Close
+    #
+    def Close(self):
+        """Shut down the worker processes"""
+
+        self.pool.shutdown()
+
+
+#  end ParallelEvaluator.py
+
@@ -8,9 +8,16 @@
 #
 ################################################################
 
+import sys
 import numpy as np
 from RE import *
 
+#  Above these dimensions "halton" and "sobol" fall back to "lhs":
+#  Sobol direction numbers run out and Halton's large prime bases
+#  leave the leading coordinates strongly correlated
+HALTON_MAX_DIM = 256
+SOBOL_MAX_DIM = len(SOBOL_PARAMS) + 1
+
 ################################################################
 #  RandomInitializer
 #
@@ -20,18 +27,54 @@ class RandomInitializer:
     #-----------------------------------------------------------
     #  __init__
     #
-    def __init__(self, npart=10, ndim=3, bounds=None, rng=None):
+    def __init__(self, npart=10, ndim=3, bounds=None, rng=None, mode="random"):
         """Constructor"""
 
         self.npart = npart
         self.ndim = ndim
         self.bounds = bounds
+        self.mode = mode.lower()  # random | lhs | halton | sobol
+        if (self.mode not in ["random", "lhs", "halton", "sobol"]):
+            raise ValueError("Unknown initialization mode: %s" % mode)
+        if ((self.mode == "halton") and (ndim > HALTON_MAX_DIM)) or \
+           ((self.mode == "sobol") and (ndim > SOBOL_MAX_DIM)):
+            print("Warning: %s initialization limited to %d dimensions, using lhs for %d" %
+                  (self.mode, HALTON_MAX_DIM if (self.mode == "halton") else SOBOL_MAX_DIM, ndim), file=sys.stderr)
+            self.mode = "lhs"
         if (rng == None):
             self.rng = RE()
         else:
             self.rng = rng
 
 
+    #-----------------------------------------------------------
+    #  Uniform
+    #
+    def Uniform(self):
+        """Return an (npart, ndim) block of [0,1) points"""
+
+        n, d = self.npart, self.ndim
+
+        if (self.mode == "lhs"):
+            #  Latin hypercube:  every dimension has one point in each
+            #  of n equal strata, in random order
+            keys = np.reshape(self.rng.random(n*d), (d,n))
+            strata = np.argsort(keys, axis=1).T
+            return (strata + np.reshape(self.rng.random(n*d), (n,d))) / n
+        elif (self.mode == "halton"):
+            #  Scrambled Halton points, scrambled according to rng
+            q = RE(kind="halton", dim=d, seed=int((1 << 31)*self.rng.random()))
+            return np.reshape(q.random(n), (n,d))
+        elif (self.mode == "sobol"):
+            #  Sobol points shifted at random, modulo 1 (Cranley-Patterson
+            #  rotation), so the first particle is not at the origin
+            q = RE(kind="sobol", dim=d)
+            return (np.reshape(q.random(n), (n,d)) + self.rng.random(d)) % 1.0
+
+        #  Uniform random, in one draw
+        return np.reshape(self.rng.random(n*d), (n,d))
+
+
     #-----------------------------------------------------------
     #  InitializeSwarm
     #
@@ -40,16 +83,12 @@ class RandomInitializer:
 
         if (self.bounds == None):
             #  No bounds given, just use [0,1)
-            self.swarm = self.rng.random((self.npart, self.ndim))
+            self.swarm = self.Uniform()
         else:
             #  Bounds given, use them
-            self.swarm = np.zeros((self.npart, self.ndim))
             lo = self.bounds.Lower()
             hi = self.bounds.Upper()
-
-            for i in range(self.npart):
-                for j in range(self.ndim):
-                    self.swarm[i,j] = lo[j] + (hi[j]-lo[j])*self.rng.random()        
+            self.swarm = lo + (hi-lo)*self.Uniform()
             self.swarm = self.bounds.Limits(self.swarm)
 
         return self.swarm
@@ -54,6 +54,13 @@ class MusicBounds(Bounds):
 
         return p
 
+    def ValidateBatch(self, pos):
+        """Discretize the notes and durations of the whole swarm"""
+
+        pos[:,0::2] = np.trunc(pos[:,0::2])
+        pos[:,1::2] = np.floor(pos[:,1::2])
+        return pos
+
 
 ################################################################
 #  MusicObjective
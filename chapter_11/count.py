@@ -33,6 +33,8 @@ elif (len(sys.argv) == 4):
 else:
     rng = RE(mode="int", low=0, high=N)
 
+values = rng.stream()  # values one at a time, generated in chunks
+
 counts = []
 iterations = []
 
@@ -40,7 +42,7 @@ for i in range(reps):
     bag = np.zeros(N, dtype="uint8")
     k = 0
     while (True):
-        n = rng.random()
+        n = next(values)
         if (bag[n]):
             break
         bag[n] = 1